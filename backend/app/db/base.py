@@ -1,12 +1,22 @@
 """Database configuration and session management."""
-from typing import AsyncGenerator
+import asyncio
+from typing import Any, AsyncGenerator
+from uuid import uuid4
 
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import NullPool
 
-from app.core.config import get_settings
+from app.core.config import settings
 
-settings = get_settings()
+# Port of PgBouncer-style transaction poolers (e.g. Supabase's pooled connection string)
+POOLER_PORT = 6543
+
+# Session settings sent by asyncpg on connect. The workload is short indexed
+# OLTP queries (webhooks, chat lists), where JIT compilation costs more than it saves.
+_SERVER_SETTINGS = {"jit": "off"}
 
 
 class Base(DeclarativeBase):
@@ -14,11 +24,48 @@ class Base(DeclarativeBase):
     pass
 
 
+def _engine_options(database_url: str) -> dict[str, Any]:
+    """
+    Pick connection options for a direct Postgres connection or a transaction pooler.
+    
+    Transaction poolers hand each transaction to an arbitrary server connection,
+    so asyncpg's named prepared statements cannot be cached (they surface as
+    DuplicatePreparedStatementError) and the pooler does the pooling itself.
+    Direct connections keep a larger per-connection statement cache instead.
+    """
+    if make_url(database_url).port == POOLER_PORT:
+        return {
+            "poolclass": NullPool,
+            "connect_args": {
+                "server_settings": _SERVER_SETTINGS,
+                "statement_cache_size": 0,
+                "prepared_statement_cache_size": 0,
+                # Unique names so statements never collide on a shared server connection
+                "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+            },
+        }
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_pre_ping": True,
+        "pool_recycle": settings.db_pool_recycle,
+        "connect_args": {
+            "server_settings": _SERVER_SETTINGS,
+            "statement_cache_size": 500,
+            "prepared_statement_cache_size": 500,
+        },
+    }
+
+
 # Create async engine
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
     future=True,
+    # Room for every compiled query variant (filters, lambda statements) so hot
+    # paths never fall out of the cache and recompile
+    query_cache_size=settings.db_query_cache_size,
+    **_engine_options(settings.database_url),
 )
 
 # Create async session factory
@@ -39,6 +86,13 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         @app.get("/items")
         async def get_items(db: AsyncSession = Depends(get_db)):
             ...
+    
+    FastAPI resolves the dependency once per request, so every helper in a
+    route shares this session and checks out at most one pooled connection.
+    Use `Depends(get_db, scope="function")` on routes that build their whole
+    response inside the handler: the session then commits and returns its
+    connection to the pool as soon as the handler returns, rather than after
+    the response has been sent.
     """
     async with AsyncSessionLocal() as session:
         try:
@@ -56,3 +110,18 @@ async def init_db() -> None:
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+
+async def warm_up_pool() -> None:
+    """
+    Open `db_pool_size` connections up front so the first burst of sync work
+    does not pay the connect/TLS/auth handshake per request. No-op with NullPool.
+    """
+    if isinstance(engine.pool, NullPool):
+        return
+
+    async def ping() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(settings.db_pool_size)))
+
@@ -1,18 +1,135 @@
 """CRUD operations for chats and messages."""
+import copy
+import json
 import logging
-from typing import Optional, Sequence, Any
-from datetime import datetime, timedelta
-
-from sqlalchemy import select, desc, and_, func
+from typing import AsyncIterator, Optional, Sequence, Any
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import (
+    Integer,
+    String,
+    select,
+    update,
+    delete,
+    desc,
+    and_,
+    or_,
+    case,
+    cast,
+    exists,
+    false,
+    func,
+    inspect,
+    lambda_stmt,
+    bindparam,
+    literal,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, make_transient_to_detached, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import TypeAdapter
 
+from app.core.cache import TTLCache
 from app.db.models import ChatModel, MessageModel, ChatAttendeeModel, PendingMessageModel
-from app.integration.unipile.schemas import Chat, Message
+from app.integration.unipile.schemas import Chat, ChatAttendee, Message
 
 
 logger = logging.getLogger(__name__)
 
+# Short-lived per-chat message counts for frequently polled chat views.
+# Invalidated whenever messages are inserted for a chat.
+_message_count_cache: TTLCache[str, int] = TTLCache(maxsize=1024, ttl=5)
+
+# Bounded caches for hot read-only lookups hit repeatedly by webhook handlers
+# and the chat endpoints. Entries are snapshots of a row's column values, never
+# a session's own instance (a rollback there would expire it for every reader);
+# hits are rebuilt as detached instances and merged into the caller's session
+# without emitting SQL. Chat mutators write the committed row back (RETURNING
+# gives the fresh state); others drop the entry.
+_chat_cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=4096, ttl=60)
+# Attendee profiles rarely change and every upsert refreshes the entries, so
+# they are kept for ATTENDEE_CACHE_TTL seconds.
+ATTENDEE_CACHE_TTL = 600
+_attendee_cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=4096, ttl=ATTENDEE_CACHE_TTL)
+_attendee_by_provider_cache: TTLCache[str, dict[str, Any]] = TTLCache(maxsize=4096, ttl=ATTENDEE_CACHE_TTL)
+
+# IDs of messages this process recently queued as pending, covering the sync
+# window right after a send. Only positive hits are trusted; misses fall back to the DB.
+_recent_pending_ids: TTLCache[str, bool] = TTLCache(maxsize=4096, ttl=600)
+
+# Upper bound on messages per bulk INSERT/UPDATE and per IN (...) lookup list,
+# keeping statements well below Postgres' bind-parameter limit.
+MESSAGE_BULK_CHUNK_SIZE = 500
+
+_JSON_MESSAGE_COLUMNS = frozenset({"attachments", "reactions", "seen_by", "quoted", "reply_to", "reply_by"})
+
+# Dumps a whole attendee batch to column dicts in one (Rust-backed) pydantic call
+_ATTENDEE_ROWS_ADAPTER = TypeAdapter(list[ChatAttendee])
+_ATTENDEE_COLUMNS = {
+    "id", "account_id", "provider_id", "name", "is_self",
+    "hidden", "picture_url", "profile_url", "specifics",
+}
+
+# Statements for hot single-row helpers, built once and parameterised with
+# bindparam() so each call reuses the same construct and its cached compilation.
+_SELECT_MESSAGE_ID = select(MessageModel.id).where(MessageModel.id == bindparam("message_id")).limit(1)
+_SELECT_LATEST_MESSAGE = (
+    select(MessageModel)
+    .where(MessageModel.chat_id == bindparam("chat_id"))
+    .order_by(desc(MessageModel.timestamp))
+    .limit(1)
+)
+_SELECT_LATEST_MESSAGE_TIMESTAMP = (
+    select(func.max(MessageModel.timestamp))
+    .where(MessageModel.chat_id == bindparam("chat_id"))
+)
+_COUNT_MESSAGES_BY_CHAT = (
+    select(func.count())
+    .select_from(MessageModel)
+    .where(MessageModel.chat_id == bindparam("chat_id"))
+)
+_SELECT_ATTENDEE_BY_PROVIDER = select(ChatAttendeeModel).where(
+    ChatAttendeeModel.provider_id == bindparam("provider_id")
+)
+_SELECT_PENDING_BY_MESSAGE_ID = select(PendingMessageModel).where(
+    PendingMessageModel.message_id == bindparam("message_id")
+)
+
+
+def _cache_row(cache: TTLCache, key: str, instance: Any) -> None:
+    """
+    Store a copy of `instance`'s loaded column values under `key`.
+    
+    Instances with expired or unloaded columns are not cached (and any stale
+    entry is dropped), since reading them back would need a lazy load.
+    """
+    state = inspect(instance)
+    loaded = state.dict
+    keys = state.mapper.column_attrs.keys()
+    if state.expired_attributes or any(key_ not in loaded for key_ in keys):
+        cache.pop(key)
+        return
+    cache[key] = copy.deepcopy({key_: loaded[key_] for key_ in keys})
+
+
+async def _cached_row(db: AsyncSession, model: type, values: dict[str, Any]) -> Any:
+    """Rebuild a cached snapshot as a clean detached instance and merge it into `db`."""
+    instance = model.__mapper__.class_manager.new_instance()
+    for key, value in copy.deepcopy(values).items():
+        set_committed_value(instance, key, value)
+    make_transient_to_detached(instance)
+    return await db.merge(instance, load=False)
+
+
+def _keyset_before(timestamp_col, id_col, before: datetime, before_id: Optional[str]):
+    """Seek predicate for newest-first pages: (timestamp, id) < cursor, or timestamp < before."""
+    if before_id is None:
+        return timestamp_col < before
+    return tuple_(timestamp_col, id_col) < tuple_(before, before_id)
+
 
 async def get_or_create_chat(
     db: AsyncSession,
@@ -21,6 +138,8 @@ async def get_or_create_chat(
     """
     Get existing chat or create new one.
     Updates timestamp and name if chat exists and data is newer.
+    Runs as a single INSERT ... ON CONFLICT DO UPDATE round trip; unchanged
+    chats are not rewritten and are read back through get_chat_by_id.
     
     Args:
         db: Database session
@@ -29,44 +148,56 @@ async def get_or_create_chat(
     Returns:
         ChatModel instance
     """
-    # Try to get existing chat
+    stmt = pg_insert(ChatModel).values(
+        id=chat_data.id,
+        account_id=chat_data.account_id,
+        account_type=chat_data.account_type,
+        provider_id=chat_data.provider_id,
+        name=chat_data.name,
+        timestamp=chat_data.timestamp,
+        unread_count=chat_data.unread_count,
+        is_read=True,  # Default to read, will be updated during message sync
+        assist_mode="manual",
+    )
+    # Only bump updated_at when the incoming timestamp is newer so chat ordering
+    # keeps reflecting message activity rather than sync runs.
+    has_newer_timestamp = and_(
+        stmt.excluded.timestamp.is_not(None),
+        or_(
+            ChatModel.timestamp.is_(None),
+            stmt.excluded.timestamp > ChatModel.timestamp,
+        ),
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ChatModel.id],
+        set_={
+            "name": func.coalesce(stmt.excluded.name, ChatModel.name),
+            "timestamp": func.greatest(ChatModel.timestamp, stmt.excluded.timestamp),
+            "unread_count": stmt.excluded.unread_count,
+            "updated_at": case(
+                (has_newer_timestamp, func.now()),
+                else_=ChatModel.updated_at,
+            ),
+        },
+        # Skip the write (and the dead tuple it leaves behind) when nothing changed
+        where=or_(
+            has_newer_timestamp,
+            and_(
+                stmt.excluded.name.is_not(None),
+                stmt.excluded.name.is_distinct_from(ChatModel.name),
+            ),
+            stmt.excluded.unread_count.is_distinct_from(ChatModel.unread_count),
+        ),
+    ).returning(ChatModel)
+
     result = await db.execute(
-        select(ChatModel).where(ChatModel.id == chat_data.id)
+        stmt, execution_options={"populate_existing": True}
     )
     chat = result.scalar_one_or_none()
-    
-    if chat:
-        # Update existing chat if timestamp is newer
-        if chat_data.timestamp and (not chat.timestamp or chat_data.timestamp > chat.timestamp):
-            chat.timestamp = chat_data.timestamp
-            chat.updated_at = datetime.utcnow()
-        
-        # Update name if provided
-        if chat_data.name:
-            chat.name = chat_data.name
-        
-        # Update unread_count
-        chat.unread_count = chat_data.unread_count
-        
-        await db.commit()
-        await db.refresh(chat)
-    else:
-        # Create new chat
-        chat = ChatModel(
-            id=chat_data.id,
-            account_id=chat_data.account_id,
-            account_type=chat_data.account_type,
-            provider_id=chat_data.provider_id,
-            name=chat_data.name,
-            timestamp=chat_data.timestamp,
-            unread_count=chat_data.unread_count,
-            is_read=True,  # Default to read, will be updated during message sync
-            assist_mode="manual",
-        )
-        db.add(chat)
-        await db.commit()
-        await db.refresh(chat)
-    
+    await db.commit()
+    if chat is None:
+        return await get_chat_by_id(db, chat_data.id)
+    _cache_row(_chat_cache, chat.id, chat)
     return chat
 
 
@@ -84,10 +215,15 @@ async def get_chat_by_id(
     Returns:
         ChatModel instance or None if not found
     """
-    result = await db.execute(
-        select(ChatModel).where(ChatModel.id == chat_id)
-    )
-    return result.scalar_one_or_none()
+    cached = _chat_cache.get(chat_id)
+    if cached is not None:
+        return await _cached_row(db, ChatModel, cached)
+    
+    # Primary-key lookup: served from the session identity map when already loaded
+    chat = await db.get(ChatModel, chat_id)
+    if chat:
+        _cache_row(_chat_cache, chat_id, chat)
+    return chat
 
 
 async def get_all_chats(
@@ -97,6 +233,9 @@ async def get_all_chats(
     is_ignored: Optional[bool] = None,
     limit: int = 100,
     offset: int = 0,
+    load_messages: bool = False,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
 ) -> Sequence[ChatModel]:
     """
     Get all chats with optional filtering.
@@ -108,37 +247,248 @@ async def get_all_chats(
         is_ignored: Filter by ignored status (default: False to exclude ignored chats)
         limit: Maximum number of results
         offset: Number of results to skip
+        load_messages: Eager-load each chat's messages (id, timestamp and text only)
+            with one extra SELECT ... WHERE chat_id IN (...) instead of a lazy load per chat
+        before: Keyset cursor; only return chats updated strictly before this time.
+            Pass the last row's updated_at to fetch the next page without OFFSET.
+        before_id: Chat id of the cursor row; with `before`, seeks past
+            (updated_at, id) so chats sharing an updated_at are neither skipped nor repeated.
         
     Returns:
         List of ChatModel instances
     """
-    query = select(ChatModel).order_by(desc(ChatModel.updated_at))
+    query = select(ChatModel).order_by(desc(ChatModel.updated_at), desc(ChatModel.id))
+    
+    if load_messages:
+        query = query.options(
+            selectinload(ChatModel.messages).load_only(
+                MessageModel.id,
+                MessageModel.timestamp,
+                MessageModel.text,
+            )
+        )
     
     # Apply filters
+    filters = _chat_filters(account_id, is_read, is_ignored)
+    if before is not None:
+        filters.append(_keyset_before(ChatModel.updated_at, ChatModel.id, before, before_id))
+    
+    query = query.where(and_(*filters)).limit(limit).offset(offset)
+    
+    result = await db.execute(query)
+    return result.scalars().all()
+
+
+def _chat_filters(
+    account_id: Optional[str],
+    is_read: Optional[bool],
+    is_ignored: Optional[bool],
+) -> list:
+    """WHERE clauses shared by the chat list and its total count."""
     filters = []
     if account_id:
         filters.append(ChatModel.account_id == account_id)
     if is_read is not None:
         filters.append(ChatModel.is_read == is_read)
-    # By default, exclude ignored chats unless explicitly requested
-    if is_ignored is None:
-        filters.append(ChatModel.is_ignored == False)
-    elif is_ignored is not None:
-        filters.append(ChatModel.is_ignored == is_ignored)
+    # By default, exclude ignored chats unless explicitly requested. Python bools
+    # render as literal true/false, so the partial is_ignored = false indexes apply.
+    filters.append(ChatModel.is_ignored == (False if is_ignored is None else is_ignored))
+    return filters
+
+
+async def iter_chat_ids(
+    db: AsyncSession,
+    account_id: Optional[str] = None,
+    batch_size: int = 500,
+) -> AsyncIterator[str]:
+    """
+    Stream the IDs of all non-ignored chats through a server-side cursor.
+    
+    Used by full syncs, which only need IDs: no ORM rows are built and only
+    `batch_size` IDs are held per round trip. The cursor lives inside the
+    session's transaction, so on a transaction pooler the session must stay
+    open (and not commit) until iteration finishes.
+    
+    Args:
+        db: Database session
+        account_id: Optional account ID to filter by
+        batch_size: Number of rows fetched from the cursor per round trip
+        
+    Yields:
+        Chat IDs, most recently updated first
+    """
+    result = await db.stream_scalars(
+        select(ChatModel.id)
+        .where(and_(*_chat_filters(account_id, None, None)))
+        .order_by(desc(ChatModel.updated_at))
+        .execution_options(yield_per=batch_size)
+    )
+    async for chat_id in result:
+        yield chat_id
+
+
+async def get_chats_page(
+    db: AsyncSession,
+    account_id: Optional[str] = None,
+    is_read: Optional[bool] = None,
+    is_ignored: Optional[bool] = None,
+    limit: int = 100,
+    offset: int = 0,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+) -> tuple[Sequence[ChatModel], int]:
+    """
+    Get a page of chats together with the number of chats matching the filters.
     
-    if filters:
-        query = query.where(and_(*filters))
+    The total is selected alongside the page as an uncorrelated scalar
+    subquery, so both come back in one round trip. It ignores `before` and
+    `offset`, counting every chat that matches the filters.
     
-    query = query.limit(limit).offset(offset)
+    Args:
+        db: Database session
+        account_id: Filter by account ID
+        is_read: Filter by read/unread status
+        is_ignored: Filter by ignored status (default: False to exclude ignored chats)
+        limit: Maximum number of results
+        offset: Number of results to skip
+        before: Keyset cursor, as in get_all_chats
+        before_id: Cursor row id, as in get_all_chats
+        
+    Returns:
+        Tuple of (ChatModel instances, total matching chats)
+    """
+    filters = _chat_filters(account_id, is_read, is_ignored)
+    count_query = select(func.count()).select_from(ChatModel).where(and_(*filters))
     
-    result = await db.execute(query)
-    return result.scalars().all()
+    page_filters = list(filters)
+    if before is not None:
+        page_filters.append(_keyset_before(ChatModel.updated_at, ChatModel.id, before, before_id))
+    
+    result = await db.execute(
+        select(ChatModel, count_query.scalar_subquery())
+        .where(and_(*page_filters))
+        .order_by(desc(ChatModel.updated_at), desc(ChatModel.id))
+        .limit(limit)
+        .offset(offset)
+    )
+    rows = result.all()
+    if not rows:
+        return [], await get_chat_count(db, account_id, is_read, is_ignored)
+    return [row[0] for row in rows], rows[0][1]
+
+
+async def get_chat_count(
+    db: AsyncSession,
+    account_id: Optional[str] = None,
+    is_read: Optional[bool] = None,
+    is_ignored: Optional[bool] = None,
+) -> int:
+    """
+    Count chats matching the same filters as get_all_chats.
+    
+    Args:
+        db: Database session
+        account_id: Filter by account ID
+        is_read: Filter by read/unread status
+        is_ignored: Filter by ignored status (default: False to exclude ignored chats)
+        
+    Returns:
+        Number of matching chats
+    """
+    result = await db.execute(
+        select(func.count())
+        .select_from(ChatModel)
+        .where(and_(*_chat_filters(account_id, is_read, is_ignored)))
+    )
+    return result.scalar_one()
+
+
+async def get_chats_with_recent_messages(
+    db: AsyncSession,
+    account_id: Optional[str] = None,
+    limit: int = 50,
+    messages_per_chat: int = 50,
+) -> Sequence[ChatModel]:
+    """
+    Get the most recently updated chats with only their latest messages loaded.
+    
+    Messages for every chat come back in one extra query that ranks rows per chat
+    with ROW_NUMBER() and keeps the newest `messages_per_chat`, so chat-list views
+    never pull whole message histories.
+    
+    Args:
+        db: Database session
+        account_id: Filter by account ID
+        limit: Maximum number of chats
+        messages_per_chat: Maximum number of messages loaded per chat
+        
+    Returns:
+        List of ChatModel instances with `messages` populated newest first
+    """
+    chats = await get_all_chats(db, account_id=account_id, limit=limit)
+    if not chats:
+        return chats
+    
+    ranked = (
+        select(
+            MessageModel,
+            func.row_number()
+            .over(partition_by=MessageModel.chat_id, order_by=desc(MessageModel.timestamp))
+            .label("row_number"),
+        )
+        .where(MessageModel.chat_id.in_([chat.id for chat in chats]))
+        .subquery()
+    )
+    recent_message = aliased(MessageModel, ranked)
+    result = await db.execute(
+        select(recent_message)
+        .where(ranked.c.row_number <= messages_per_chat)
+        .order_by(ranked.c.chat_id, ranked.c.row_number)
+    )
+    
+    messages_by_chat: dict[str, list[MessageModel]] = {chat.id: [] for chat in chats}
+    for message in result.scalars():
+        messages_by_chat[message.chat_id].append(message)
+    for chat in chats:
+        set_committed_value(chat, "messages", messages_by_chat[chat.id])
+    return chats
+
+
+async def _update_chat(
+    db: AsyncSession,
+    chat_id: str,
+    **values: Any,
+) -> Optional[ChatModel]:
+    """
+    Apply column updates to a chat with a single UPDATE ... RETURNING.
+    
+    Rows that already hold every value are not rewritten (repeated mark-read
+    calls are the common case); those fall back to get_chat_by_id, which is
+    normally a cache hit.
+    """
+    stmt = (
+        update(ChatModel)
+        .where(
+            ChatModel.id == chat_id,
+            or_(*(getattr(ChatModel, key).is_distinct_from(value) for key, value in values.items())),
+        )
+        .values(**values)
+        .returning(ChatModel)
+        .execution_options(synchronize_session=False)
+    )
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    chat = result.scalar_one_or_none()
+    await db.commit()
+    if chat is None:
+        return await get_chat_by_id(db, chat_id)
+    _cache_row(_chat_cache, chat_id, chat)
+    return chat
 
 
 async def update_chat_timestamp(
     db: AsyncSession,
     chat_id: str,
-    timestamp: str,
+    timestamp: datetime,
 ) -> Optional[ChatModel]:
     """
     Update chat's last message timestamp.
@@ -146,18 +496,12 @@ async def update_chat_timestamp(
     Args:
         db: Database session
         chat_id: Chat ID
-        timestamp: ISO 8601 timestamp
+        timestamp: Timestamp of the latest message
         
     Returns:
         Updated ChatModel instance or None if not found
     """
-    chat = await get_chat_by_id(db, chat_id)
-    if chat:
-        chat.timestamp = timestamp
-        chat.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(chat)
-    return chat
+    return await _update_chat(db, chat_id, timestamp=timestamp)
 
 
 async def mark_chat_as_read(
@@ -174,13 +518,7 @@ async def mark_chat_as_read(
     Returns:
         Updated ChatModel instance or None if not found
     """
-    chat = await get_chat_by_id(db, chat_id)
-    if chat:
-        chat.is_read = True
-        chat.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(chat)
-    return chat
+    return await _update_chat(db, chat_id, is_read=True)
 
 
 async def mark_chat_as_unread(
@@ -197,13 +535,7 @@ async def mark_chat_as_unread(
     Returns:
         Updated ChatModel instance or None if not found
     """
-    chat = await get_chat_by_id(db, chat_id)
-    if chat:
-        chat.is_read = False
-        chat.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(chat)
-    return chat
+    return await _update_chat(db, chat_id, is_read=False)
 
 
 async def update_chat_assist_mode(
@@ -221,10 +553,10 @@ async def update_chat_assist_mode(
     if chat.assist_mode == assist_mode:
         return chat
     
+    _chat_cache.pop(chat_id)
     chat.assist_mode = assist_mode
-    chat.updated_at = datetime.utcnow()
     await db.commit()
-    await db.refresh(chat)
+    _cache_row(_chat_cache, chat_id, chat)
     return chat
 
 
@@ -242,13 +574,7 @@ async def ignore_chat(
     Returns:
         Updated ChatModel instance or None if not found
     """
-    chat = await get_chat_by_id(db, chat_id)
-    if chat:
-        chat.is_ignored = True
-        chat.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(chat)
-    return chat
+    return await _update_chat(db, chat_id, is_ignored=True)
 
 
 async def unignore_chat(
@@ -265,13 +591,7 @@ async def unignore_chat(
     Returns:
         Updated ChatModel instance or None if not found
     """
-    chat = await get_chat_by_id(db, chat_id)
-    if chat:
-        chat.is_ignored = False
-        chat.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(chat)
-    return chat
+    return await _update_chat(db, chat_id, is_ignored=False)
 
 
 async def get_message_by_id(
@@ -288,18 +608,35 @@ async def get_message_by_id(
     Returns:
         MessageModel instance or None if not found
     """
-    result = await db.execute(
-        select(MessageModel).where(MessageModel.id == message_id)
-    )
-    return result.scalar_one_or_none()
+    # Primary-key lookup: served from the session identity map when already loaded
+    return await db.get(MessageModel, message_id)
+
+
+async def message_exists(
+    db: AsyncSession,
+    message_id: str,
+) -> bool:
+    """
+    Check whether a message has been stored, without loading the row.
+    
+    Args:
+        db: Database session
+        message_id: Message ID to look up
+        
+    Returns:
+        True if the message exists
+    """
+    existing_id = await db.scalar(_SELECT_MESSAGE_ID, {"message_id": message_id})
+    return existing_id is not None
 
 
 def _message_schema_to_dict(message_data: Message) -> dict[str, Any]:
     """Convert a Unipile Message schema into ORM-friendly dict data."""
-    attachments = [
-        att if isinstance(att, dict) else att.model_dump() for att in message_data.attachments
-    ]
-    reactions = [r.model_dump() for r in message_data.reactions]
+    # One serialization pass for all nested fields instead of per-item model_dump()
+    nested = message_data.model_dump(
+        mode="json",
+        include={"attachments", "reactions", "quoted", "reply_to"},
+    )
     return {
         "chat_id": message_data.chat_id,
         "account_id": message_data.account_id,
@@ -310,11 +647,11 @@ def _message_schema_to_dict(message_data: Message) -> dict[str, Any]:
         "text": message_data.text,
         "timestamp": message_data.timestamp,
         "is_sender": message_data.is_sender,
-        "attachments": attachments,
-        "reactions": reactions,
+        "attachments": nested["attachments"],
+        "reactions": nested["reactions"],
         "seen_by": message_data.seen_by,
-        "quoted": message_data.quoted.model_dump() if message_data.quoted else None,
-        "reply_to": message_data.reply_to.model_dump() if message_data.reply_to else None,
+        "quoted": nested["quoted"],
+        "reply_to": nested["reply_to"],
         "seen": message_data.seen,
         "hidden": message_data.hidden,
         "deleted": message_data.deleted,
@@ -335,25 +672,179 @@ def _message_schema_to_dict(message_data: Message) -> dict[str, Any]:
     }
 
 
-async def _find_existing_message(
+async def _prepare_message_rows(
     db: AsyncSession,
-    message_id: Optional[str],
-    provider_id: Optional[str],
-) -> Optional[MessageModel]:
-    """Find an existing message by primary key or provider_id."""
-    if message_id:
+    batch: list[Message],
+) -> list[dict[str, Any]]:
+    """Build insertable rows for one chunk of unique messages, resolving senders and pending overrides in two queries."""
+    # Resolve sender_id: use attendee's provider_id if available
+    attendee_ids = {m.sender_attendee_id for m in batch if m.sender_attendee_id}
+    attendee_provider_ids: dict[str, str] = {}
+    if attendee_ids:
         result = await db.execute(
-            select(MessageModel).where(MessageModel.id == message_id)
+            select(ChatAttendeeModel.id, ChatAttendeeModel.provider_id)
+            .where(ChatAttendeeModel.id.in_(attendee_ids))
         )
-        message = result.scalar_one_or_none()
-        if message:
-            return message
-    if provider_id:
-        result = await db.execute(
-            select(MessageModel).where(MessageModel.provider_id == provider_id)
+        attendee_provider_ids = {row.id: row.provider_id for row in result if row.provider_id}
+
+    # Unipile sometimes returns is_sender=0 for messages we sent, so messages
+    # found in the pending queue are forced to is_sender=1
+    pending_ids = await get_pending_message_ids(db, [m.id for m in batch])
+
+    rows: list[dict[str, Any]] = []
+    for message_data in batch:
+        row = {"id": message_data.id, **_message_schema_to_dict(message_data)}
+        row["sender_id"] = attendee_provider_ids.get(
+            message_data.sender_attendee_id, message_data.sender_id
+        )
+        if message_data.id in pending_ids:
+            row["is_sender"] = 1
+        rows.append(row)
+    if pending_ids:
+        logger.debug("%d message(s) found in pending queue, setting is_sender=1", len(pending_ids))
+    return rows
+
+
+async def _write_messages_chunk(
+    db: AsyncSession,
+    batch: list[Message],
+) -> list[MessageModel]:
+    """Resolve lookups for one chunk of unique messages, then INSERT new rows and UPDATE existing ones."""
+    rows = await _prepare_message_rows(db, batch)
+
+    result = await db.execute(
+        select(MessageModel.id, MessageModel.provider_id).where(
+            or_(
+                MessageModel.id.in_([row["id"] for row in rows]),
+                MessageModel.provider_id.in_([row["provider_id"] for row in rows]),
+            )
+        )
+    )
+    existing_ids: set[str] = set()
+    existing_by_provider_id: dict[str, str] = {}
+    for existing in result:
+        existing_ids.add(existing.id)
+        existing_by_provider_id[existing.provider_id] = existing.id
+
+    new_rows: list[dict[str, Any]] = []
+    update_rows: list[dict[str, Any]] = []
+    for row in rows:
+        if row["id"] in existing_ids:
+            existing_id = row["id"]
+        else:
+            existing_id = existing_by_provider_id.get(row["provider_id"])
+        if existing_id:
+            update_rows.append({**row, "id": existing_id})
+        else:
+            new_rows.append(row)
+
+    created: list[MessageModel] = []
+    if new_rows:
+        result = await db.scalars(
+            pg_insert(MessageModel).on_conflict_do_nothing().returning(MessageModel),
+            new_rows,
+        )
+        created = list(result.all())
+    if update_rows:
+        await db.execute(update(MessageModel), update_rows)
+
+    return created
+
+
+async def create_messages_bulk(
+    db: AsyncSession,
+    messages: Sequence[Message],
+) -> list[MessageModel]:
+    """
+    Create a batch of messages, updating the metadata of ones that already exist.
+
+    Sender and pending-queue lookups, the existence probe, the INSERT and the
+    UPDATE each run once per chunk of MESSAGE_BULK_CHUNK_SIZE messages instead
+    of once per message, and the whole batch is committed once.
+
+    Args:
+        db: Database session
+        messages: Message data from Unipile API
+
+    Returns:
+        List of newly created MessageModel instances (existing messages are excluded)
+    """
+    # Deduplicate within the batch, keeping the last occurrence of each message
+    unique: dict[str, Message] = {}
+    for message_data in messages:
+        unique[message_data.id] = message_data
+    if not unique:
+        return []
+    batch = list(unique.values())
+
+    created: list[MessageModel] = []
+    for start in range(0, len(batch), MESSAGE_BULK_CHUNK_SIZE):
+        created.extend(
+            await _write_messages_chunk(db, batch[start:start + MESSAGE_BULK_CHUNK_SIZE])
         )
-        return result.scalar_one_or_none()
-    return None
+
+    await db.commit()
+    for chat_id in {message.chat_id for message in created}:
+        _message_count_cache.pop(chat_id)
+    return created
+
+
+async def bulk_copy_messages(
+    db: AsyncSession,
+    messages: Sequence[Message],
+) -> list[dict[str, Any]]:
+    """
+    Import messages with Postgres COPY instead of INSERT.
+    
+    Meant for the initial import of a chat that has no stored messages yet:
+    COPY streams rows without per-statement parse/plan overhead, but it has no
+    ON CONFLICT handling, so the whole call fails if any message already exists.
+    The COPY runs inside a SAVEPOINT, so a failure only undoes the COPY and
+    leaves the rest of the session's transaction usable; callers should fall
+    back to create_messages_bulk on error.
+    
+    Args:
+        db: Database session
+        messages: Message data from Unipile API
+        
+    Returns:
+        The inserted rows as dicts (sender and pending overrides applied)
+    """
+    unique: dict[str, Message] = {}
+    for message_data in messages:
+        unique[message_data.id] = message_data
+    if not unique:
+        return []
+    batch = list(unique.values())
+
+    rows: list[dict[str, Any]] = []
+    for start in range(0, len(batch), MESSAGE_BULK_CHUNK_SIZE):
+        rows.extend(await _prepare_message_rows(db, batch[start:start + MESSAGE_BULK_CHUNK_SIZE]))
+
+    # The asyncpg JSON/JSONB codecs installed by SQLAlchemy take pre-encoded text
+    columns = list(rows[0])
+    records = [
+        tuple(
+            json.dumps(row[column])
+            if column in _JSON_MESSAGE_COLUMNS and row[column] is not None
+            else row[column]
+            for column in columns
+        )
+        for row in rows
+    ]
+
+    async with db.begin_nested():
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            MessageModel.__tablename__,
+            records=records,
+            columns=columns,
+        )
+    await db.commit()
+    for chat_id in {row["chat_id"] for row in rows}:
+        _message_count_cache.pop(chat_id)
+    return rows
 
 
 async def create_message(
@@ -363,44 +854,60 @@ async def create_message(
     """
     Create a new message if it doesn't already exist.
     If a matching message exists, update its metadata in-place.
+    Thin wrapper around create_messages_bulk for a single message.
     """
-    # Resolve sender_id: use attendee's provider_id if available
-    resolved_sender_id = message_data.sender_id
-    if message_data.sender_attendee_id:
-        attendee = await get_attendee_by_id(db, message_data.sender_attendee_id)
-        if attendee and attendee.provider_id:
-            resolved_sender_id = attendee.provider_id
-
-    # Check if this message exists in pending_messages to correctly set is_sender
-    # Unipile sometimes returns is_sender=0 for messages we sent, so we need to override it
-    pending_check = await db.execute(
-        select(PendingMessageModel).where(PendingMessageModel.message_id == message_data.id)
-    )
-    pending_message = pending_check.scalar_one_or_none()
-    is_sender_value = message_data.is_sender
-    if pending_message:
-        is_sender_value = 1
-        logger.info(f"Message {message_data.id} found in pending queue, setting is_sender=1")
-
-    existing_message = await _find_existing_message(db, message_data.id, message_data.provider_id)
-    payload = _message_schema_to_dict(message_data)
-    payload["sender_id"] = resolved_sender_id
-    payload["is_sender"] = is_sender_value
+    created = await create_messages_bulk(db, [message_data])
+    return created[0] if created else None
 
-    if existing_message:
-        for key, value in payload.items():
-            setattr(existing_message, key, value)
-        await db.commit()
-        await db.refresh(existing_message)
-        return None
 
-    message = MessageModel(
-        id=message_data.id,
-        **payload,
+async def upsert_message_and_touch_chat(
+    db: AsyncSession,
+    message_data: Message,
+) -> Optional[MessageModel]:
+    """
+    Insert a received message and bump its chat in one statement.
+    
+    Runs as INSERT ... ON CONFLICT DO NOTHING RETURNING inside a CTE, with a
+    second CTE that advances the chat's timestamp and marks it unread only
+    when the insert produced a row. Replaces create_message +
+    update_chat_timestamp + mark_chat_as_unread for webhook deliveries.
+    Unlike create_message, an existing message is left untouched.
+    
+    Args:
+        db: Database session
+        message_data: Message data from the Unipile webhook
+        
+    Returns:
+        The newly created MessageModel, or None if the message already existed
+    """
+    rows = await _prepare_message_rows(db, [message_data])
+    
+    inserted = (
+        pg_insert(MessageModel)
+        .values(rows[0])
+        .on_conflict_do_nothing()
+        .returning(*MessageModel.__table__.columns)
+        .cte("inserted")
+    )
+    touched = (
+        update(ChatModel)
+        .where(ChatModel.id == inserted.c.chat_id)
+        .values(
+            timestamp=func.greatest(ChatModel.timestamp, inserted.c.timestamp),
+            is_read=False,
+        )
+        .returning(ChatModel.id)
+        .cte("touched")
     )
-    db.add(message)
+    result = await db.execute(
+        select(aliased(MessageModel, inserted)).add_cte(touched),
+        execution_options={"populate_existing": True},
+    )
+    message = result.scalar_one_or_none()
     await db.commit()
-    await db.refresh(message)
+    if message is not None:
+        _chat_cache.pop(message.chat_id)
+        _message_count_cache.pop(message.chat_id)
     return message
 
 
@@ -410,6 +917,7 @@ async def get_messages_by_chat(
     limit: int = 100,
     offset: int = 0,
     order_desc: bool = True,
+    before: Optional[datetime] = None,
 ) -> Sequence[MessageModel]:
     """
     Get messages for a specific chat.
@@ -420,20 +928,184 @@ async def get_messages_by_chat(
         limit: Maximum number of results
         offset: Number of results to skip
         order_desc: Order by timestamp descending (newest first)
+        before: Keyset cursor; only return messages with a timestamp strictly before
+            this value. Pass the last row's timestamp to page backwards
+            through history without OFFSET.
         
     Returns:
         List of MessageModel instances
     """
-    order = desc(MessageModel.timestamp) if order_desc else MessageModel.timestamp
+    # lambda_stmt caches the constructed statement per code path, so repeat
+    # calls only extract the closure values as bound parameters
+    stmt = lambda_stmt(lambda: select(MessageModel).where(MessageModel.chat_id == chat_id))
+    if before is not None:
+        stmt += lambda s: s.where(MessageModel.timestamp < before)
+    if order_desc:
+        stmt += lambda s: s.order_by(desc(MessageModel.timestamp))
+    else:
+        stmt += lambda s: s.order_by(MessageModel.timestamp)
+    stmt += lambda s: s.limit(limit).offset(offset)
+    
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+def _unsynced_pending_filter(chat_id_param):
+    """Pending rows for a chat whose message has not been synced into messages yet."""
+    return and_(
+        PendingMessageModel.chat_id == chat_id_param,
+        PendingMessageModel.status == "pending",
+        ~exists().where(MessageModel.id == PendingMessageModel.message_id),
+    )
+
+
+async def get_merged_chat_messages(
+    db: AsyncSession,
+    chat_id: str,
+    limit: int = 100,
+    offset: int = 0,
+    order_desc: bool = True,
+    before: Optional[datetime] = None,
+    before_id: Optional[str] = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    Get a page of synced and still-pending messages for a chat in one query.
+    
+    Pending messages that have no synced copy yet are UNION ALL'd onto the
+    chat's messages with placeholder values for the columns they lack, so
+    ordering, LIMIT/OFFSET and the keyset cursor all apply in Postgres. The
+    total (all synced messages plus unsynced pending ones, independent of
+    `before`/`offset`) is selected in the same statement.
     
+    Args:
+        db: Database session
+        chat_id: Chat ID
+        limit: Maximum number of results
+        offset: Number of results to skip
+        order_desc: Order by timestamp descending (newest first)
+        before: Keyset cursor; only return messages with a timestamp strictly before this value
+        before_id: Message id of the cursor row; with `before`, seeks past (timestamp, id)
+        
+    Returns:
+        Tuple of (row dicts shaped like MessageResponse, total count)
+    """
+    chat_id_param = bindparam("chat_id")
+    empty_list = cast(literal("[]"), JSONB)
+    
+    synced = select(
+        MessageModel.id,
+        MessageModel.chat_id,
+        MessageModel.account_id,
+        MessageModel.provider_id,
+        MessageModel.sender_id,
+        MessageModel.sender_attendee_id,
+        MessageModel.text,
+        MessageModel.timestamp,
+        MessageModel.is_sender,
+        MessageModel.attachments,
+        MessageModel.reactions,
+        MessageModel.seen,
+        MessageModel.hidden,
+        MessageModel.deleted,
+        MessageModel.edited,
+        MessageModel.is_event,
+        MessageModel.delivered,
+        MessageModel.sent_by_autopilot,
+        MessageModel.created_at,
+    ).where(MessageModel.chat_id == chat_id_param)
+    
+    pending = select(
+        PendingMessageModel.message_id,
+        PendingMessageModel.chat_id,
+        literal("", String),  # account_id is not known for pending messages
+        PendingMessageModel.message_id,
+        literal("self", String),
+        literal("self", String),
+        PendingMessageModel.text,
+        PendingMessageModel.timestamp,
+        literal(1, Integer),
+        empty_list,
+        empty_list,
+        literal(0, Integer),
+        literal(0, Integer),
+        literal(0, Integer),
+        literal(0, Integer),
+        literal(0, Integer),
+        literal(1, Integer),
+        false(),
+        PendingMessageModel.created_at,
+    ).where(_unsynced_pending_filter(chat_id_param))
+    
+    if before is not None:
+        synced = synced.where(
+            _keyset_before(MessageModel.timestamp, MessageModel.id, before, before_id)
+        )
+        pending = pending.where(
+            _keyset_before(PendingMessageModel.timestamp, PendingMessageModel.message_id, before, before_id)
+        )
+    
+    merged = union_all(synced, pending).subquery("merged")
+    
+    total = (
+        select(func.count()).select_from(MessageModel).where(MessageModel.chat_id == chat_id_param)
+    ).scalar_subquery() + (
+        select(func.count()).select_from(PendingMessageModel).where(_unsynced_pending_filter(chat_id_param))
+    ).scalar_subquery()
+    
+    order = (
+        (desc(merged.c.timestamp), desc(merged.c.id))
+        if order_desc
+        else (merged.c.timestamp, merged.c.id)
+    )
     result = await db.execute(
+        select(merged, total.label("total")).order_by(*order).limit(limit).offset(offset),
+        {"chat_id": chat_id},
+    )
+    rows = [dict(row) for row in result.mappings()]
+    if not rows:
+        # An unfiltered first page that is empty means the chat has no messages
+        if before is None and offset == 0:
+            return [], 0
+        count = await db.execute(select(total), {"chat_id": chat_id})
+        return [], count.scalar_one()
+    
+    total_count = rows[0]["total"]
+    for row in rows:
+        del row["total"]
+    return rows, total_count
+
+
+async def iter_messages_by_chat(
+    db: AsyncSession,
+    chat_id: str,
+    batch_size: int = 500,
+    order_desc: bool = False,
+) -> AsyncIterator[MessageModel]:
+    """
+    Stream every message for a chat through a server-side cursor.
+    
+    Unlike get_messages_by_chat, rows are fetched `batch_size` at a time, so
+    exports and full-history reads keep a bounded memory footprint.
+    
+    Args:
+        db: Database session
+        chat_id: Chat ID
+        batch_size: Number of rows fetched from the cursor per round trip
+        order_desc: Order by timestamp descending (newest first)
+        
+    Yields:
+        MessageModel instances
+    """
+    order = desc(MessageModel.timestamp) if order_desc else MessageModel.timestamp
+    
+    result = await db.stream_scalars(
         select(MessageModel)
         .where(MessageModel.chat_id == chat_id)
         .order_by(order)
-        .limit(limit)
-        .offset(offset)
+        .execution_options(yield_per=batch_size)
     )
-    return result.scalars().all()
+    async for message in result:
+        yield message
 
 
 async def create_local_outbound_message(
@@ -441,7 +1113,7 @@ async def create_local_outbound_message(
     chat: ChatModel,
     message_id: str,
     text: Optional[str],
-    timestamp: str,
+    timestamp: datetime,
     attachments: Optional[list[dict[str, Any]]] = None,
     sent_by_autopilot: bool = False,
 ) -> MessageModel:
@@ -486,21 +1158,18 @@ async def create_local_outbound_message(
         "sent_by_autopilot": sent_by_autopilot,
     }
 
-    existing = await get_message_by_id(db, message_id)
-    if existing:
-        for key, value in payload.items():
-            setattr(existing, key, value)
-        await db.commit()
-        await db.refresh(existing)
-        return existing
+    # Single INSERT ... ON CONFLICT DO UPDATE ... RETURNING instead of a lookup
+    # followed by an INSERT or UPDATE
+    stmt = pg_insert(MessageModel).values(id=message_id, **payload)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[MessageModel.id],
+        set_={key: stmt.excluded[key] for key in payload},
+    ).returning(MessageModel)
 
-    message = MessageModel(
-        id=message_id,
-        **payload,
-    )
-    db.add(message)
+    result = await db.execute(stmt, execution_options={"populate_existing": True})
+    message = result.scalar_one()
     await db.commit()
-    await db.refresh(message)
+    _message_count_cache.pop(chat.id)
     return message
 
 
@@ -511,19 +1180,14 @@ async def get_latest_message(
     """
     Get the most recent message in a chat.
     """
-    result = await db.execute(
-        select(MessageModel)
-        .where(MessageModel.chat_id == chat_id)
-        .order_by(desc(MessageModel.timestamp))
-        .limit(1)
-    )
+    result = await db.execute(_SELECT_LATEST_MESSAGE, {"chat_id": chat_id})
     return result.scalar_one_or_none()
 
 
 async def get_latest_message_timestamp(
     db: AsyncSession,
     chat_id: str,
-) -> Optional[str]:
+) -> Optional[datetime]:
     """
     Get the timestamp of the latest message in a chat.
     Used for incremental syncing.
@@ -533,14 +1197,10 @@ async def get_latest_message_timestamp(
         chat_id: Chat ID
         
     Returns:
-        ISO 8601 timestamp string or None if no messages
+        Timestamp or None if no messages
     """
-    result = await db.execute(
-        select(MessageModel.timestamp)
-        .where(MessageModel.chat_id == chat_id)
-        .order_by(desc(MessageModel.timestamp))
-        .limit(1)
-    )
+    # MAX() is answered straight from idx_messages_chat_timestamp
+    result = await db.execute(_SELECT_LATEST_MESSAGE_TIMESTAMP, {"chat_id": chat_id})
     return result.scalar_one_or_none()
 
 
@@ -558,19 +1218,70 @@ async def get_message_count_by_chat(
     Returns:
         Message count
     """
-    result = await db.execute(
-        select(func.count(MessageModel.id))
-        .where(MessageModel.chat_id == chat_id)
+    cached = _message_count_cache.get(chat_id)
+    if cached is not None:
+        return cached
+    
+    result = await db.execute(_COUNT_MESSAGES_BY_CHAT, {"chat_id": chat_id})
+    count = result.scalar_one()
+    _message_count_cache[chat_id] = count
+    return count
+
+
+async def upsert_attendees_bulk(
+    db: AsyncSession,
+    attendees: Sequence[ChatAttendee],
+) -> list[ChatAttendeeModel]:
+    """
+    Create or update a batch of chat attendees.
+    Runs as one INSERT ... ON CONFLICT DO UPDATE statement for the whole batch.
+    
+    Args:
+        db: Database session
+        attendees: ChatAttendee data from Unipile API
+        
+    Returns:
+        List of upserted ChatAttendeeModel instances
+    """
+    dumped = _ATTENDEE_ROWS_ADAPTER.dump_python(
+        list(attendees), mode="json", include={"__all__": _ATTENDEE_COLUMNS}
     )
-    return result.scalar_one()
+    # ON CONFLICT cannot touch the same row twice in one statement; keep the last copy
+    rows = list({row["id"]: row for row in dumped}.values())
+    if not rows:
+        return []
+
+    stmt = pg_insert(ChatAttendeeModel)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ChatAttendeeModel.id],
+        set_={
+            "name": stmt.excluded.name,
+            "picture_url": stmt.excluded.picture_url,
+            "profile_url": stmt.excluded.profile_url,
+            "specifics": stmt.excluded.specifics,
+            "hidden": stmt.excluded.hidden,
+            "updated_at": func.now(),
+        },
+    ).returning(ChatAttendeeModel)
+
+    result = await db.scalars(
+        stmt, rows, execution_options={"populate_existing": True}
+    )
+    upserted = list(result.all())
+    await db.commit()
+    for attendee in upserted:
+        _cache_row(_attendee_cache, attendee.id, attendee)
+        _cache_row(_attendee_by_provider_cache, attendee.provider_id, attendee)
+    return upserted
 
 
 async def upsert_attendee(
     db: AsyncSession,
-    attendee_data: any,
+    attendee_data: ChatAttendee,
 ) -> ChatAttendeeModel:
     """
     Create or update a chat attendee.
+    Thin wrapper around upsert_attendees_bulk for a single attendee.
     
     Args:
         db: Database session
@@ -579,43 +1290,8 @@ async def upsert_attendee(
     Returns:
         ChatAttendeeModel instance
     """
-    # Try to get existing attendee
-    result = await db.execute(
-        select(ChatAttendeeModel).where(ChatAttendeeModel.id == attendee_data.id)
-    )
-    attendee = result.scalar_one_or_none()
-    
-    # Convert specifics to dict if it exists
-    specifics_dict = attendee_data.specifics.model_dump() if attendee_data.specifics else None
-    
-    if attendee:
-        # Update existing attendee
-        attendee.name = attendee_data.name
-        attendee.picture_url = attendee_data.picture_url
-        attendee.profile_url = attendee_data.profile_url
-        attendee.specifics = specifics_dict
-        attendee.hidden = attendee_data.hidden
-        attendee.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(attendee)
-    else:
-        # Create new attendee
-        attendee = ChatAttendeeModel(
-            id=attendee_data.id,
-            account_id=attendee_data.account_id,
-            provider_id=attendee_data.provider_id,
-            name=attendee_data.name,
-            is_self=attendee_data.is_self,
-            hidden=attendee_data.hidden,
-            picture_url=attendee_data.picture_url,
-            profile_url=attendee_data.profile_url,
-            specifics=specifics_dict,
-        )
-        db.add(attendee)
-        await db.commit()
-        await db.refresh(attendee)
-    
-    return attendee
+    upserted = await upsert_attendees_bulk(db, [attendee_data])
+    return upserted[0]
 
 
 async def get_attendee_by_id(
@@ -632,10 +1308,15 @@ async def get_attendee_by_id(
     Returns:
         ChatAttendeeModel instance or None if not found
     """
-    result = await db.execute(
-        select(ChatAttendeeModel).where(ChatAttendeeModel.id == attendee_id)
-    )
-    return result.scalar_one_or_none()
+    cached = _attendee_cache.get(attendee_id)
+    if cached is not None:
+        return await _cached_row(db, ChatAttendeeModel, cached)
+    
+    # Primary-key lookup: served from the session identity map when already loaded
+    attendee = await db.get(ChatAttendeeModel, attendee_id)
+    if attendee:
+        _cache_row(_attendee_cache, attendee_id, attendee)
+    return attendee
 
 
 async def get_attendee_by_provider_id(
@@ -652,10 +1333,48 @@ async def get_attendee_by_provider_id(
     Returns:
         ChatAttendeeModel instance or None if not found
     """
-    result = await db.execute(
-        select(ChatAttendeeModel).where(ChatAttendeeModel.provider_id == provider_id)
-    )
-    return result.scalar_one_or_none()
+    cached = _attendee_by_provider_cache.get(provider_id)
+    if cached is not None:
+        return await _cached_row(db, ChatAttendeeModel, cached)
+    
+    result = await db.execute(_SELECT_ATTENDEE_BY_PROVIDER, {"provider_id": provider_id})
+    attendee = result.scalar_one_or_none()
+    if attendee:
+        _cache_row(_attendee_by_provider_cache, provider_id, attendee)
+    return attendee
+
+
+async def get_attendees_by_provider_ids(
+    db: AsyncSession,
+    provider_ids: Sequence[str],
+) -> list[ChatAttendeeModel]:
+    """
+    Get attendees for several provider IDs with at most one query.
+    
+    Args:
+        db: Database session
+        provider_ids: Provider IDs to look up; unknown IDs are skipped
+        
+    Returns:
+        List of ChatAttendeeModel instances found, cached entries first
+    """
+    attendees = []
+    missing = []
+    for provider_id in dict.fromkeys(provider_ids):
+        cached = _attendee_by_provider_cache.get(provider_id)
+        if cached is not None:
+            attendees.append(await _cached_row(db, ChatAttendeeModel, cached))
+        else:
+            missing.append(provider_id)
+    
+    if missing:
+        result = await db.execute(
+            select(ChatAttendeeModel).where(ChatAttendeeModel.provider_id.in_(missing))
+        )
+        for attendee in result.scalars():
+            _cache_row(_attendee_by_provider_cache, attendee.provider_id, attendee)
+            attendees.append(attendee)
+    return attendees
 
 
 async def get_attendees_by_account(
@@ -680,6 +1399,35 @@ async def get_attendees_by_account(
     return result.scalars().all()
 
 
+async def iter_attendees_by_account(
+    db: AsyncSession,
+    account_id: str,
+    batch_size: int = 500,
+) -> AsyncIterator[ChatAttendeeModel]:
+    """
+    Stream every attendee for an account through a server-side cursor.
+    
+    Rows are fetched `batch_size` at a time, so large accounts do not have to
+    be materialised in memory the way get_attendees_by_account does.
+    
+    Args:
+        db: Database session
+        account_id: Account ID
+        batch_size: Number of rows fetched from the cursor per round trip
+        
+    Yields:
+        ChatAttendeeModel instances ordered by name
+    """
+    result = await db.stream_scalars(
+        select(ChatAttendeeModel)
+        .where(ChatAttendeeModel.account_id == account_id)
+        .order_by(ChatAttendeeModel.name)
+        .execution_options(yield_per=batch_size)
+    )
+    async for attendee in result:
+        yield attendee
+
+
 # =============================================================================
 # Pending Message CRUD Operations
 # =============================================================================
@@ -690,7 +1438,7 @@ async def create_pending_message(
     message_id: str,
     chat_id: str,
     text: Optional[str],
-    timestamp: str,
+    timestamp: datetime,
 ) -> PendingMessageModel:
     """
     Create a pending message after successful send to Unipile.
@@ -700,7 +1448,7 @@ async def create_pending_message(
         message_id: Message ID from Unipile response
         chat_id: Chat ID
         text: Message text content
-        timestamp: ISO 8601 timestamp
+        timestamp: Time the message was sent
         
     Returns:
         PendingMessageModel instance
@@ -715,10 +1463,36 @@ async def create_pending_message(
     )
     db.add(pending_message)
     await db.commit()
-    await db.refresh(pending_message)
+    _recent_pending_ids[message_id] = True
     return pending_message
 
 
+async def get_pending_message_ids(
+    db: AsyncSession,
+    message_ids: Sequence[str],
+) -> set[str]:
+    """
+    Return which of the given message IDs are in the pending queue, in one query.
+    
+    Args:
+        db: Database session
+        message_ids: Message IDs to check
+        
+    Returns:
+        Set of message IDs that have a pending-queue entry
+    """
+    pending_ids = {message_id for message_id in message_ids if message_id in _recent_pending_ids}
+    unknown_ids = [message_id for message_id in message_ids if message_id not in pending_ids]
+    if not unknown_ids:
+        return pending_ids
+    result = await db.execute(
+        select(PendingMessageModel.message_id)
+        .where(PendingMessageModel.message_id.in_(unknown_ids))
+    )
+    pending_ids.update(result.scalars().all())
+    return pending_ids
+
+
 async def get_pending_messages(
     db: AsyncSession,
     chat_id: Optional[str] = None,
@@ -737,18 +1511,23 @@ async def get_pending_messages(
     Returns:
         List of PendingMessageModel instances
     """
-    query = select(PendingMessageModel).where(PendingMessageModel.status == status)
+    stmt = lambda_stmt(
+        lambda: select(PendingMessageModel).where(PendingMessageModel.status == status)
+    )
     
     if chat_id:
-        query = query.where(PendingMessageModel.chat_id == chat_id)
+        stmt += lambda s: s.where(PendingMessageModel.chat_id == chat_id)
     
     if older_than_seconds is not None:
-        cutoff_time = datetime.utcnow() - timedelta(seconds=older_than_seconds)
-        query = query.where(PendingMessageModel.created_at <= cutoff_time)
+        # Compared as an aware datetime: binds with the column's TIMESTAMPTZ type,
+        # whereas a timedelta closed over in the lambda would get the same type
+        # and be rejected by asyncpg
+        cutoff_time = datetime.now(timezone.utc) - timedelta(seconds=older_than_seconds)
+        stmt += lambda s: s.where(PendingMessageModel.created_at <= cutoff_time)
     
-    query = query.order_by(PendingMessageModel.created_at)
+    stmt += lambda s: s.order_by(PendingMessageModel.created_at)
     
-    result = await db.execute(query)
+    result = await db.execute(stmt)
     return result.scalars().all()
 
 
@@ -767,16 +1546,16 @@ async def mark_pending_as_synced(
         Updated PendingMessageModel or None if not found
     """
     result = await db.execute(
-        select(PendingMessageModel).where(PendingMessageModel.message_id == message_id)
+        update(PendingMessageModel)
+        .where(PendingMessageModel.message_id == message_id)
+        .values(status="synced")
+        .returning(PendingMessageModel)
+        .execution_options(synchronize_session=False),
+        execution_options={"populate_existing": True},
     )
     pending_message = result.scalar_one_or_none()
-    
-    if pending_message:
-        pending_message.status = "synced"
-        pending_message.updated_at = datetime.utcnow()
-        await db.commit()
-        await db.refresh(pending_message)
-    
+    await db.commit()
+    _recent_pending_ids.pop(message_id)
     return pending_message
 
 
@@ -797,20 +1576,16 @@ async def increment_sync_attempts(
     Returns:
         Updated PendingMessageModel or None if not found
     """
-    result = await db.execute(
-        select(PendingMessageModel).where(PendingMessageModel.message_id == message_id)
-    )
+    result = await db.execute(_SELECT_PENDING_BY_MESSAGE_ID, {"message_id": message_id})
     pending_message = result.scalar_one_or_none()
     
     if pending_message:
         pending_message.sync_attempts += 1
-        pending_message.updated_at = datetime.utcnow()
         
         if pending_message.sync_attempts >= max_attempts:
             pending_message.status = "failed"
         
         await db.commit()
-        await db.refresh(pending_message)
     
     return pending_message
 
@@ -830,22 +1605,19 @@ async def delete_synced_pending_messages(
     Returns:
         Number of deleted messages
     """
-    cutoff_time = datetime.utcnow() - timedelta(hours=older_than_hours)
+    # Compare against the database clock, which also stamps updated_at
+    cutoff_time = func.now() - timedelta(hours=older_than_hours)
     
     result = await db.execute(
-        select(PendingMessageModel)
+        delete(PendingMessageModel)
         .where(
             and_(
                 PendingMessageModel.status == "synced",
                 PendingMessageModel.updated_at <= cutoff_time
             )
         )
+        .execution_options(synchronize_session=False)
     )
-    messages_to_delete = result.scalars().all()
-    
-    for message in messages_to_delete:
-        await db.delete(message)
-    
     await db.commit()
-    return len(messages_to_delete)
+    return result.rowcount
 
@@ -2,7 +2,8 @@
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, JSON, ForeignKey, Index
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.base import Base
@@ -14,6 +15,8 @@ class ChatModel(Base):
     Maps to Unipile Chat object with additional local fields.
     """
     __tablename__ = "chats"
+    # Fetch server-generated created_at/updated_at via RETURNING instead of a lazy reload.
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key - from Unipile
     id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -23,12 +26,18 @@ class ChatModel(Base):
     account_type: Mapped[str] = mapped_column(String, nullable=False)
     provider_id: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
     name: Mapped[str | None] = mapped_column(String, nullable=True)
-    timestamp: Mapped[str | None] = mapped_column(String, nullable=True)  # ISO 8601 from Unipile
+    timestamp: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # Last activity from Unipile
     unread_count: Mapped[int] = mapped_column(Integer, default=0)
     
     # Local fields for our app
     is_read: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False, index=True)
-    is_ignored: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False, index=True)
+    # Low-cardinality flag: served by the partial chat-list indexes below rather than its own index
+    is_ignored: Mapped[bool] = mapped_column(
+        Boolean,
+        default=False,
+        nullable=False,
+        server_default="false",
+    )
     assist_mode: Mapped[str] = mapped_column(
         String(32),
         default="manual",
@@ -38,19 +47,27 @@ class ChatModel(Base):
     )
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime, 
-        default=datetime.utcnow, 
-        onupdate=datetime.utcnow, 
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
     
-    # Relationship to messages
+    # Relationship to messages. Never lazy-loaded: callers must opt in with
+    # selectinload(ChatModel.messages) or use get_chats_with_recent_messages().
+    # Deletes rely on the ON DELETE CASCADE foreign key instead of loading rows.
     messages: Mapped[list["MessageModel"]] = relationship(
         "MessageModel", 
         back_populates="chat",
-        cascade="all, delete-orphan"
+        cascade="all, delete-orphan",
+        lazy="raise",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -63,6 +80,7 @@ class MessageModel(Base):
     Maps to Unipile Message object.
     """
     __tablename__ = "messages"
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key - from Unipile
     id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -82,15 +100,15 @@ class MessageModel(Base):
     sender_id: Mapped[str] = mapped_column(String, nullable=False)
     sender_attendee_id: Mapped[str] = mapped_column(String, nullable=False)
     text: Mapped[str | None] = mapped_column(Text, nullable=True)
-    timestamp: Mapped[str] = mapped_column(String, nullable=False, index=True)  # ISO 8601
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     is_sender: Mapped[int] = mapped_column(Integer, nullable=False)  # 0 or 1
     
-    # Complex fields stored as JSON
-    attachments: Mapped[list[Any]] = mapped_column(JSON, default=list, nullable=False)
-    reactions: Mapped[list[dict[str, Any]]] = mapped_column(JSON, default=list, nullable=False)
-    seen_by: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict, nullable=False)
-    quoted: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
-    reply_to: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Complex fields stored as JSONB
+    attachments: Mapped[list[Any]] = mapped_column(JSONB, default=list, nullable=False)
+    reactions: Mapped[list[dict[str, Any]]] = mapped_column(JSONB, default=list, nullable=False)
+    seen_by: Mapped[dict[str, Any]] = mapped_column(JSONB, default=dict, nullable=False)
+    quoted: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    reply_to: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     
     # Integer flags from Unipile
     seen: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
@@ -112,7 +130,7 @@ class MessageModel(Base):
     original: Mapped[str | None] = mapped_column(Text, nullable=True)
     event_type: Mapped[int | None] = mapped_column(Integer, nullable=True)
     replies: Mapped[int | None] = mapped_column(Integer, nullable=True)
-    reply_by: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    reply_by: Mapped[list[str] | None] = mapped_column(JSONB, nullable=True)
     parent: Mapped[str | None] = mapped_column(String, nullable=True)
     subject: Mapped[str | None] = mapped_column(String, nullable=True)
     message_type: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -121,10 +139,15 @@ class MessageModel(Base):
     sender_urn: Mapped[str | None] = mapped_column(String, nullable=True)
     
     # Local timestamp
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
     
-    # Relationship to chat
-    chat: Mapped["ChatModel"] = relationship("ChatModel", back_populates="messages")
+    # Relationship to chat. Never lazy-loaded (an implicit load would be one
+    # SELECT per message); opt in with joinedload(MessageModel.chat).
+    chat: Mapped["ChatModel"] = relationship("ChatModel", back_populates="messages", lazy="raise")
 
     def __repr__(self) -> str:
         return (
@@ -139,6 +162,7 @@ class ChatAttendeeModel(Base):
     Caches attendee data including profile pictures.
     """
     __tablename__ = "chat_attendees"
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key - from Unipile
     id: Mapped[str] = mapped_column(String, primary_key=True)
@@ -154,15 +178,19 @@ class ChatAttendeeModel(Base):
     picture_url: Mapped[str | None] = mapped_column(String, nullable=True)
     profile_url: Mapped[str | None] = mapped_column(String, nullable=True)
     
-    # Instagram specifics stored as JSON
-    specifics: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    # Instagram specifics stored as JSONB
+    specifics: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
 
@@ -176,6 +204,7 @@ class PendingMessageModel(Base):
     These are messages sent via Unipile that haven't been synced to the messages table yet.
     """
     __tablename__ = "pending_messages"
+    __mapper_args__ = {"eager_defaults": True}
 
     # Primary key - auto-increment
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
@@ -195,7 +224,7 @@ class PendingMessageModel(Base):
     text: Mapped[str | None] = mapped_column(Text, nullable=True)
     
     # Timestamp when message was sent
-    timestamp: Mapped[str] = mapped_column(String, nullable=False, index=True)  # ISO 8601
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
     
     # Status tracking
     status: Mapped[str] = mapped_column(
@@ -209,24 +238,60 @@ class PendingMessageModel(Base):
     sync_attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
     
     # Timestamps
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime,
-        default=datetime.utcnow,
-        onupdate=datetime.utcnow,
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False
     )
     
-    # Relationship to chat
-    chat: Mapped["ChatModel"] = relationship("ChatModel")
+    # Relationship to chat (never lazy-loaded, as on MessageModel)
+    chat: Mapped["ChatModel"] = relationship("ChatModel", lazy="raise")
 
     def __repr__(self) -> str:
         return f"<PendingMessageModel(id={self.id}, message_id={self.message_id}, status={self.status})>"
 
 
 # Create indexes for common queries
-Index("idx_messages_chat_timestamp", MessageModel.chat_id, MessageModel.timestamp)
-Index("idx_chats_account_updated", ChatModel.account_id, ChatModel.updated_at)
-Index("idx_attendees_provider", ChatAttendeeModel.provider_id)
+# id breaks timestamp ties so (timestamp, id) keyset pages are read straight off the index
+Index(
+    "idx_messages_chat_timestamp",
+    MessageModel.chat_id,
+    MessageModel.timestamp.desc(),
+    MessageModel.id.desc(),
+)
+Index(
+    "idx_chats_account_read_updated",
+    ChatModel.account_id,
+    ChatModel.is_read,
+    ChatModel.updated_at.desc(),
+)
+# Partial indexes for the default chat list (ignored chats excluded, newest first)
+Index(
+    "idx_chats_not_ignored_updated",
+    ChatModel.updated_at.desc(),
+    ChatModel.id.desc(),
+    postgresql_where=(ChatModel.is_ignored == False),
+)
+Index(
+    "idx_chats_account_not_ignored_updated",
+    ChatModel.account_id,
+    ChatModel.updated_at.desc(),
+    ChatModel.id.desc(),
+    postgresql_where=(ChatModel.is_ignored == False),
+)
 Index("idx_pending_messages_status_created", PendingMessageModel.status, PendingMessageModel.created_at)
+# The pending half of the merged message list is usually empty; this keeps it a
+# single probe of a tiny partial index instead of a scan of the chat's history
+Index(
+    "idx_pending_messages_chat_pending",
+    PendingMessageModel.chat_id,
+    PendingMessageModel.timestamp.desc(),
+    postgresql_where=(PendingMessageModel.status == "pending"),
+)
 
@@ -10,6 +10,7 @@ from app.features.auth.security import decode_access_token
 
 # OAuth2 scheme for token authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login", auto_error=False)
 
 
 async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]) -> User:
@@ -1,34 +1,130 @@
+import sqlite3
+from datetime import datetime
 from typing import Optional
 
 from app.features.auth.models import User
 from app.features.auth.security import get_password_hash
 
-# Mock database using a dictionary
+# Mock database using a shared-cache in-memory SQLite database; every
+# connection in this process that opens this URI sees the same tables.
 # In production, this would be replaced with actual database queries
-fake_users_db: dict[str, User] = {}
+MOCK_DB_URI = "file:setdm_users?mode=memory&cache=shared"
+
+_USER_COLUMNS = "username, email, hashed_password, full_name, disabled, created_at"
+
+
+class UserRepo:
+    """
+    Mock user store backed by SQLite.
+
+    Lookups are indexed B-tree probes executed in C; the UNIQUE constraint on
+    the lower-cased email doubles as the email index.
+    """
+
+    def __init__(self, uri: str = MOCK_DB_URI):
+        # The in-memory database lives as long as this connection stays open
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS users (
+                username TEXT PRIMARY KEY,
+                email TEXT NOT NULL,
+                email_lower TEXT NOT NULL UNIQUE,
+                hashed_password TEXT NOT NULL,
+                full_name TEXT,
+                disabled INTEGER NOT NULL DEFAULT 0,
+                created_at TEXT NOT NULL
+            );
+            """
+        )
+
+    @staticmethod
+    def _to_user(row: Optional[tuple]) -> Optional[User]:
+        if row is None:
+            return None
+        username, email, hashed_password, full_name, disabled, created_at = row
+        return User(
+            username=username,
+            email=email,
+            hashed_password=hashed_password,
+            full_name=full_name,
+            disabled=bool(disabled),
+            created_at=datetime.fromisoformat(created_at),
+        )
+
+    def get_by_username(self, username: str) -> Optional[User]:
+        row = self._conn.execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return self._to_user(row)
+
+    def get_by_email(self, email: str) -> Optional[User]:
+        row = self._conn.execute(
+            f"SELECT {_USER_COLUMNS} FROM users WHERE email_lower = ?", (email.lower(),)
+        ).fetchone()
+        return self._to_user(row)
+
+    def exists(self, username: str) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM users WHERE username = ?", (username,)
+        ).fetchone()
+        return row is not None
+
+    def add(self, user: User) -> None:
+        """Insert a user; raises sqlite3.IntegrityError on a duplicate username or email."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO users (username, email, email_lower, hashed_password, full_name, disabled, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user.username,
+                    user.email,
+                    user.email.lower(),
+                    user.hashed_password,
+                    user.full_name,
+                    int(user.disabled),
+                    user.created_at.isoformat(),
+                ),
+            )
+
+
+user_repo = UserRepo()
+
+# Seeding hashes two passwords with bcrypt, so it runs on first access
+# rather than at import to keep worker startup fast.
+_initialized = False
 
 
 def init_mock_db():
     """Initialize the mock database with some default users."""
+    global _initialized
+    _initialized = True
+    
     # Create a demo user
-    demo_user = User(
-        username="demo",
-        email="demo@example.com",
-        hashed_password=get_password_hash("demo123"),
-        full_name="Demo User",
-        disabled=False,
-    )
-    fake_users_db["demo"] = demo_user
+    if not user_repo.exists("demo"):
+        user_repo.add(User(
+            username="demo",
+            email="demo@example.com",
+            hashed_password=get_password_hash("demo123"),
+            full_name="Demo User",
+            disabled=False,
+        ))
     
     # Create an admin user
-    admin_user = User(
-        username="admin",
-        email="admin@example.com",
-        hashed_password=get_password_hash("admin123"),
-        full_name="Admin User",
-        disabled=False,
-    )
-    fake_users_db["admin"] = admin_user
+    if not user_repo.exists("admin"):
+        user_repo.add(User(
+            username="admin",
+            email="admin@example.com",
+            hashed_password=get_password_hash("admin123"),
+            full_name="Admin User",
+            disabled=False,
+        ))
+
+
+def _ensure_initialized() -> None:
+    """Seed the demo users on first access instead of at import time."""
+    if not _initialized:
+        init_mock_db()
 
 
 def get_user(username: str) -> Optional[User]:
@@ -37,11 +133,12 @@ def get_user(username: str) -> Optional[User]:
     
     Args:
         username: Username to search for
-        
+    
     Returns:
         User object if found, None otherwise
     """
-    return fake_users_db.get(username)
+    _ensure_initialized()
+    return user_repo.get_by_username(username)
 
 
 def get_user_by_email(email: str) -> Optional[User]:
@@ -50,14 +147,12 @@ def get_user_by_email(email: str) -> Optional[User]:
     
     Args:
         email: Email to search for
-        
+    
     Returns:
         User object if found, None otherwise
     """
-    for user in fake_users_db.values():
-        if user.email == email:
-            return user
-    return None
+    _ensure_initialized()
+    return user_repo.get_by_email(email)
 
 
 def create_user(username: str, email: str, hashed_password: str, full_name: Optional[str] = None) -> User:
@@ -69,14 +164,15 @@ def create_user(username: str, email: str, hashed_password: str, full_name: Opti
         email: Email for the new user
         hashed_password: Hashed password for the new user
         full_name: Optional full name for the new user
-        
+    
     Returns:
         Created User object
-        
+    
     Raises:
         ValueError: If username or email already exists
     """
-    if username in fake_users_db:
+    _ensure_initialized()
+    if user_repo.exists(username):
         raise ValueError("Username already exists")
     
     if get_user_by_email(email):
@@ -89,7 +185,11 @@ def create_user(username: str, email: str, hashed_password: str, full_name: Opti
         full_name=full_name,
         disabled=False,
     )
-    fake_users_db[username] = user
+    try:
+        user_repo.add(user)
+    except sqlite3.IntegrityError as e:
+        # Lost a race with a concurrent registration
+        raise ValueError("Username or email already exists") from e
     return user
 
 
@@ -99,13 +199,9 @@ def user_exists(username: str) -> bool:
     
     Args:
         username: Username to check
-        
+    
     Returns:
         True if user exists, False otherwise
     """
-    return username in fake_users_db
-
-
-# Initialize the mock database on import
-init_mock_db()
-
+    _ensure_initialized()
+    return user_repo.exists(username)
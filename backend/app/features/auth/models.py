@@ -1,25 +1,24 @@
-from datetime import datetime
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 from typing import Optional
 
+_UTC = timezone.utc
 
+
+def _utcnow() -> datetime:
+    return datetime.now(_UTC)
+
+
+@dataclass(slots=True)
 class User:
     """User model for authentication."""
 
-    def __init__(
-        self,
-        username: str,
-        email: str,
-        hashed_password: str,
-        full_name: Optional[str] = None,
-        disabled: bool = False,
-        created_at: Optional[datetime] = None,
-    ):
-        self.username = username
-        self.email = email
-        self.hashed_password = hashed_password
-        self.full_name = full_name
-        self.disabled = disabled
-        self.created_at = created_at or datetime.now()
+    username: str
+    email: str
+    hashed_password: str
+    full_name: Optional[str] = None
+    disabled: bool = False
+    created_at: datetime = field(default_factory=_utcnow)
 
     def dict(self):
         """Convert user to dictionary."""
@@ -30,4 +29,3 @@ class User:
             "disabled": self.disabled,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
-
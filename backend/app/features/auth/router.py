@@ -1,23 +1,41 @@
 from datetime import timedelta
+from functools import cache
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.core.config import get_settings
-from app.features.auth.dependencies import get_current_active_user
+from app.core.config import settings
+from app.features.auth.dependencies import (
+    get_current_active_user,
+    optional_oauth2_scheme,
+)
 from app.features.auth.models import User
 from app.features.auth.mock_db import create_user, get_user
 from app.features.auth.schemas import Token, UserCreate, UserResponse
 from app.features.auth.security import (
     create_access_token,
     get_password_hash,
+    revoke_access_token,
     verify_password,
 )
 
-settings = get_settings()
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
+# Settings are fixed for the process lifetime, so build these once
+_ACCESS_TOKEN_EXPIRES = timedelta(minutes=settings.access_token_expire_minutes)
+_TOKEN_TYPE = "bearer"
+
+
+@cache
+def _dummy_hash() -> str:
+    """
+    Hash verified against when the username is unknown, so a missing user
+    costs the same bcrypt round as a wrong password and cannot be told apart
+    by timing. Built on first use to keep bcrypt off the import path.
+    """
+    return get_password_hash("dummy-password")
+
 
 def authenticate_user(username: str, password: str) -> User | None:
     """
@@ -31,9 +49,10 @@ def authenticate_user(username: str, password: str) -> User | None:
         User object if authentication successful, None otherwise
     """
     user = get_user(username)
-    if not user:
-        return None
-    if not verify_password(password, user.hashed_password):
+    password_ok = verify_password(
+        password, user.hashed_password if user else _dummy_hash()
+    )
+    if not user or not password_ok:
         return None
     return user
 
@@ -100,12 +119,11 @@ async def login(form_data: Annotated[OAuth2PasswordRequestForm, Depends()]):
         )
     
     # Create access token
-    access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username}, expires_delta=_ACCESS_TOKEN_EXPIRES
     )
     
-    return Token(access_token=access_token, token_type="bearer")
+    return Token(access_token=access_token, token_type=_TOKEN_TYPE)
 
 
 @router.get("/me", response_model=UserResponse)
@@ -130,17 +148,21 @@ async def get_current_user_info(
 
 
 @router.post("/logout")
-async def logout():
+async def logout(
+    token: Annotated[str | None, Depends(optional_oauth2_scheme)] = None,
+):
     """
-    Logout endpoint (stateless JWT, so just a placeholder).
+    Logout endpoint.
     
-    In a real application with JWT, logout would typically involve:
-    - Token blacklisting
-    - Clearing client-side stored tokens
-    - Token revocation lists
+    If a valid bearer token is supplied it is added to the in-process
+    revocation list so it is rejected (and evicted from the decode cache)
+    until it expires. Invalid or expired tokens are ignored. Clients must
+    still clear their stored token.
     
     Returns:
         Success message
     """
+    if token:
+        revoke_access_token(token)
     return {"message": "Successfully logged out"}
 
@@ -1,19 +1,78 @@
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
-from app.core.config import get_settings
+from app.core.cache import TTLCache
+from app.core.config import settings
 
-settings = get_settings()
+_UTC = timezone.utc
 
-# Password hashing context
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+
+
+def _b64url(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+# For HMAC algorithms the header segment and keyed HMAC state never change, so
+# they are built once and create_access_token only encodes and signs the payload.
+_JWT_HEADER_SEGMENT: Optional[bytes] = None
+_JWT_SIGNER: Optional["hmac.HMAC"] = None
+if settings.algorithm in _HMAC_DIGESTS:
+    _JWT_HEADER_SEGMENT = _b64url(
+        json.dumps({"alg": settings.algorithm, "typ": "JWT"}, separators=(",", ":")).encode()
+    )
+    _JWT_SIGNER = hmac.new(settings.secret_key.encode(), digestmod=_HMAC_DIGESTS[settings.algorithm])
+
+
+def _encode_hmac_jwt(claims: dict) -> str:
+    """Encode `claims` as a compact JWT using the precomputed header and key."""
+    payload_segment = _b64url(json.dumps(claims, separators=(",", ":")).encode())
+    signing_input = _JWT_HEADER_SEGMENT + b"." + payload_segment
+    signer = _JWT_SIGNER.copy()
+    signer.update(signing_input)
+    return (signing_input + b"." + _b64url(signer.digest())).decode("ascii")
+
+
+# Decoded payloads keyed by token fingerprint (see _token_fingerprint).
+# Entries never outlive the token itself: `exp` is re-checked on every hit.
+_decoded_token_cache: TTLCache[bytes, tuple[str, dict]] = TTLCache(
+    maxsize=10_000, ttl=max(settings.access_token_expire_minutes * 60 - 30, 1)
+)
+
+# Tokens revoked through /auth/logout, checked before the decode cache. Each
+# entry (fingerprint -> exp) is kept exactly until the token expires; there is
+# no size-based eviction, and only verified tokens are ever added.
+_revoked_tokens: dict[bytes, float] = {}
+_revocation_expiries: list[tuple[float, bytes]] = []
+
+# Password hashing context. The backend is pinned to the compiled `bcrypt`
+# package (Rust, pinned in pyproject) so passlib never silently falls back to
+# a slower implementation; a missing backend fails at startup instead.
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context.handler("bcrypt").set_backend("bcrypt")
+
+
+def _token_fingerprint(token: str) -> bytes:
+    """
+    Cache key for a bearer token.
+    
+    Dict lookups then compare fixed-size digests rather than attacker-supplied
+    token strings; cache hits are confirmed with hmac.compare_digest.
+    """
+    return hashlib.sha256(token.encode()).digest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
+    """Verify a plain password against a hashed password (constant time in passlib)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
@@ -36,18 +95,21 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     to_encode = data.copy()
     
     if expires_delta:
-        expire = datetime.now(timezone.utc) + expires_delta
+        expire = datetime.now(_UTC) + expires_delta
     else:
-        expire = datetime.now(timezone.utc) + timedelta(
+        expire = datetime.now(_UTC) + timedelta(
             minutes=settings.access_token_expire_minutes
         )
+
+    # A unique id per token, so each login gets its own token and revoking
+    # one session never affects another
+    to_encode.setdefault("jti", secrets.token_urlsafe(16))
     
+    if _JWT_SIGNER is not None:
+        to_encode["exp"] = int(expire.timestamp())
+        return _encode_hmac_jwt(to_encode)
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.secret_key, algorithm=settings.algorithm
-    )
-    
-    return encoded_jwt
+    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
 
 
 def decode_access_token(token: str) -> Optional[dict]:
@@ -60,11 +122,57 @@ def decode_access_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token payload or None if invalid
     """
+    fingerprint = _token_fingerprint(token)
+    if fingerprint in _revoked_tokens:
+        return None
+
+    cached = _decoded_token_cache.get(fingerprint)
+    if cached is not None:
+        cached_token, payload = cached
+        if not hmac.compare_digest(cached_token.encode(), token.encode()):
+            return None
+        if payload.get("exp", 0) > datetime.now(_UTC).timestamp():
+            return payload
+        _decoded_token_cache.pop(fingerprint)
+        return None
+
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
         )
-        return payload
     except JWTError:
         return None
 
+    _decoded_token_cache[fingerprint] = (token, payload)
+    return payload
+
+
+def _purge_expired_revocations(now: float) -> None:
+    while _revocation_expiries and _revocation_expiries[0][0] <= now:
+        _, fingerprint = heapq.heappop(_revocation_expiries)
+        _revoked_tokens.pop(fingerprint, None)
+
+
+def revoke_access_token(token: str) -> bool:
+    """
+    Reject `token` on subsequent decodes until it expires.
+    
+    The token is verified first, so arbitrary strings are never recorded.
+    
+    Returns:
+        True if the token was valid and is now revoked, False otherwise
+    """
+    payload = decode_access_token(token)
+    if payload is None:
+        return False
+    
+    now = datetime.now(_UTC).timestamp()
+    _purge_expired_revocations(now)
+    
+    fingerprint = _token_fingerprint(token)
+    expires_at = float(payload["exp"])
+    _revoked_tokens[fingerprint] = expires_at
+    heapq.heappush(_revocation_expiries, (expires_at, fingerprint))
+    _decoded_token_cache.pop(fingerprint)
+    return True
+
@@ -1,27 +1,33 @@
 """API router for chats and messages."""
+import base64
+import binascii
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.base import get_db
 from app.db.crud import (
-    get_all_chats,
+    get_chats_page,
     get_chat_by_id,
     get_messages_by_chat,
+    get_merged_chat_messages,
     mark_chat_as_read,
     ignore_chat,
     unignore_chat,
-    get_message_count_by_chat,
     get_attendee_by_provider_id,
-    upsert_attendee,
-    get_pending_messages,
+    get_attendees_by_provider_ids,
+    upsert_attendees_bulk,
     update_chat_assist_mode,
 )
-from app.services.message_sync import sync_chat_messages, sync_all_chat_messages
+from app.services.message_sync import ChatNotFound, sync_chat_messages, sync_all_chat_messages
 from app.integration.unipile.client import get_unipile_client
 from app.features.chats.schemas import (
+    AttendeeResponse,
     ChatResponse,
     ChatListResponse,
     MessageResponse,
@@ -32,11 +38,64 @@ from app.features.chats.schemas import (
     UpdateAssistModeRequest,
 )
 from app.services.ai_assistant import generate_sales_response, AISuggestionError
-from app.core.config import get_settings
+from app.core.cache import TTLCache
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/chats", tags=["chats"])
 
+# Validate whole pages of ORM rows in a single pydantic-core call
+_CHAT_LIST_ADAPTER = TypeAdapter(list[ChatResponse])
+_MESSAGE_LIST_ADAPTER = TypeAdapter(list[MessageResponse])
+_ATTENDEE_ADAPTER = TypeAdapter(AttendeeResponse)
+_ATTENDEE_LIST_ADAPTER = TypeAdapter(list[AttendeeResponse])
+
+# Attendees per chat from the last Unipile fetch, keyed by provider_id, so
+# repeated lookups for the same chat (including misses) skip the API call.
+_chat_attendees_cache: TTLCache[str, dict[str, AttendeeResponse]] = TTLCache(maxsize=10_000, ttl=60)
+
+
+def _json_response(payload: BaseModel) -> Response:
+    """
+    Serialize an already-validated response model with pydantic-core.
+    
+    Returning a Response skips FastAPI's response_model validation and its
+    jsonable_encoder + json.dumps pass, which dominate large list endpoints
+    after DB I/O. Envelopes are built with model_construct() because their
+    items were validated by the list adapters already.
+    """
+    return Response(content=payload.model_dump_json(), media_type="application/json")
+
+
+def _encode_cursor(timestamp: datetime, row_id: str) -> str:
+    """Opaque keyset cursor for the row a page ended on."""
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    """Split a cursor from _encode_cursor back into (timestamp, id); 400 if malformed."""
+    try:
+        timestamp, row_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), row_id
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _wants_ndjson(accept: Optional[str]) -> bool:
+    return accept is not None and _NDJSON_MEDIA_TYPE in accept
+
+
+def _ndjson_response(items: Iterable[BaseModel]) -> StreamingResponse:
+    """Stream items as newline-delimited JSON, one serialized line at a time."""
+    def lines() -> Iterator[bytes]:
+        for item in items:
+            yield item.model_dump_json().encode() + b"\n"
+    
+    return StreamingResponse(lines(), media_type=_NDJSON_MEDIA_TYPE)
+
 
 @router.get("", response_model=ChatListResponse)
 async def list_chats(
@@ -45,7 +104,10 @@ async def list_chats(
     account_id: Optional[str] = Query(None, description="Filter by account ID"),
     limit: int = Query(100, ge=1, le=250, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Keyset cursor: the next_cursor of the previous page"),
+    before: Optional[datetime] = Query(None, description="Legacy keyset cursor: return chats updated before this time"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Get all chats from the database.
@@ -56,38 +118,54 @@ async def list_chats(
     - account_id: Filter by specific account ID
     - limit: Maximum number of results (1-250)
     - offset: Number of results to skip (for pagination)
+    - cursor: Keyset cursor; pass the previous page's next_cursor to fetch the next page
+    - before: Legacy timestamp-only cursor (chats sharing an updated_at may be skipped)
     
     Returns:
-    - List of chats with metadata
+    - List of chats with metadata, or one chat per line when the client sends
+      `Accept: application/x-ndjson`
     """
+    before_id = None
+    if cursor:
+        before, before_id = _decode_cursor(cursor)
+    
     try:
-        chats = await get_all_chats(
+        chats, total = await get_chats_page(
             db,
             account_id=account_id,
             is_read=is_read,
             is_ignored=is_ignored,
             limit=limit,
             offset=offset,
+            before=before,
+            before_id=before_id,
         )
         
         # Convert to response models
-        chat_responses = [ChatResponse.model_validate(chat) for chat in chats]
+        chat_responses = _CHAT_LIST_ADAPTER.validate_python(chats, from_attributes=True)
+        if _wants_ndjson(accept):
+            return _ndjson_response(chat_responses)
         
-        return ChatListResponse(
+        return _json_response(ChatListResponse.model_construct(
             items=chat_responses,
-            total=len(chat_responses),  # Note: This is count in current page, not total
+            total=total,
             limit=limit,
             offset=offset,
-        )
+            next_cursor=(
+                _encode_cursor(chats[-1].updated_at, chats[-1].id)
+                if len(chats) == limit
+                else None
+            ),
+        ))
     except Exception as e:
-        logger.error(f"Error fetching chats: {str(e)}")
+        logger.error("Error fetching chats: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch chats: {str(e)}")
 
 
 @router.get("/{chat_id}", response_model=ChatResponse)
 async def get_chat(
     chat_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Get a specific chat by ID.
@@ -108,7 +186,7 @@ async def get_chat(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching chat {chat_id}: {str(e)}")
+        logger.error("Error fetching chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch chat: {str(e)}")
 
 
@@ -118,7 +196,10 @@ async def list_chat_messages(
     limit: int = Query(100, ge=1, le=250, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     order_desc: bool = Query(True, description="Order by timestamp descending (newest first)"),
-    db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description="Keyset cursor: the next_cursor of the previous page"),
+    before: Optional[datetime] = Query(None, description="Legacy keyset cursor: return messages sent before this time"),
+    accept: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Get messages for a specific chat.
@@ -130,83 +211,54 @@ async def list_chat_messages(
     - limit: Maximum number of results (1-250)
     - offset: Number of results to skip (for pagination)
     - order_desc: Order by timestamp descending (true = newest first, false = oldest first)
+    - cursor: Keyset cursor; pass the previous page's next_cursor to load older messages
+    - before: Legacy timestamp-only cursor (messages sharing a timestamp may be skipped)
     
     Returns:
-    - List of messages for the chat
+    - List of messages for the chat, including sent messages still awaiting
+      sync, or one message per line when the client sends
+      `Accept: application/x-ndjson`
     """
     try:
-        # Check if chat exists
-        chat = await get_chat_by_id(db, chat_id)
-        if not chat:
-            raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
+        before_id = None
+        if cursor:
+            before, before_id = _decode_cursor(cursor)
         
-        # Get synced messages
-        synced_messages = await get_messages_by_chat(
+        # Synced and pending messages, merged, sorted and paginated in Postgres,
+        # together with the chat's total in one round trip
+        rows, total_count = await get_merged_chat_messages(
             db,
             chat_id=chat_id,
             limit=limit,
             offset=offset,
             order_desc=order_desc,
+            before=before,
+            before_id=before_id,
         )
         
-        # Get pending messages for this chat
-        pending_messages = await get_pending_messages(
-            db,
-            chat_id=chat_id,
-            status="pending",
-        )
-        
-        # Merge pending and synced messages
-        # Filter out pending messages that already exist in synced
-        synced_ids = {msg.id for msg in synced_messages}
-        unique_pending = [p for p in pending_messages if p.message_id not in synced_ids]
-        
-        # Convert pending messages to MessageResponse format
-        pending_responses = []
-        for pending_msg in unique_pending:
-            pending_responses.append(MessageResponse(
-                id=pending_msg.message_id,
-                account_id="",  # Not available in pending
-                chat_id=pending_msg.chat_id,
-                provider_id=pending_msg.message_id,
-                sender_id="self",
-                sender_attendee_id="self",
-                text=pending_msg.text,
-                timestamp=pending_msg.timestamp,
-                is_sender=1,
-                attachments=[],
-                reactions=[],
-                seen=0,
-                hidden=0,
-                deleted=0,
-                edited=0,
-                is_event=0,
-                delivered=1,
-                sent_by_autopilot=False,
-                created_at=pending_msg.created_at,
-            ))
-        
-        # Merge synced and pending messages
-        synced_responses = [MessageResponse.model_validate(msg) for msg in synced_messages]
-        all_messages = synced_responses + pending_responses
-        
-        # Sort by timestamp
-        all_messages.sort(key=lambda m: m.timestamp, reverse=order_desc)
+        # Only an empty page needs the separate chat existence check
+        if not rows and not await get_chat_by_id(db, chat_id):
+            raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
         
-        # Get total count (synced + unique pending)
-        total_count = await get_message_count_by_chat(db, chat_id)
-        total_with_pending = total_count + len(unique_pending)
+        all_messages = _MESSAGE_LIST_ADAPTER.validate_python(rows)
+        if _wants_ndjson(accept):
+            return _ndjson_response(all_messages)
         
-        return MessageListResponse(
+        return _json_response(MessageListResponse.model_construct(
             items=all_messages,
-            total=total_with_pending,
+            total=total_count,
             limit=limit,
             offset=offset,
-        )
+            next_cursor=(
+                _encode_cursor(all_messages[-1].timestamp, all_messages[-1].id)
+                if order_desc and len(all_messages) == limit
+                else None
+            ),
+        ))
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching messages for chat {chat_id}: {str(e)}")
+        logger.error("Error fetching messages for chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch messages: {str(e)}")
 
 
@@ -214,7 +266,7 @@ async def list_chat_messages(
 async def generate_ai_response(
     chat_id: str,
     request: GenerateResponseRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Generate an AI-assisted response for the specified chat.
@@ -226,7 +278,6 @@ async def generate_ai_response(
         if not chat:
             raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
 
-        settings = get_settings()
         history_limit = request.history_limit or settings.openai_history_limit
 
         messages = await get_messages_by_chat(
@@ -263,7 +314,7 @@ async def generate_ai_response(
 @router.post("/{chat_id}/mark-read", response_model=ChatResponse)
 async def mark_chat_read(
     chat_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Mark a chat as read.
@@ -284,7 +335,7 @@ async def mark_chat_read(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error marking chat {chat_id} as read: {str(e)}")
+        logger.error("Error marking chat %s as read: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to mark chat as read: {str(e)}")
 
 
@@ -292,7 +343,7 @@ async def mark_chat_read(
 async def set_chat_assist_mode(
     chat_id: str,
     request: UpdateAssistModeRequest,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Update the assist/autopilot mode for a chat.
@@ -307,14 +358,14 @@ async def set_chat_assist_mode(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating assist mode for chat {chat_id}: {str(e)}")
+        logger.error("Error updating assist mode for chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to update assist mode: {str(e)}")
 
 
 @router.post("/{chat_id}/ignore", response_model=ChatResponse)
 async def ignore_chat_endpoint(
     chat_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Ignore a chat.
@@ -335,14 +386,14 @@ async def ignore_chat_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error ignoring chat {chat_id}: {str(e)}")
+        logger.error("Error ignoring chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to ignore chat: {str(e)}")
 
 
 @router.post("/{chat_id}/unignore", response_model=ChatResponse)
 async def unignore_chat_endpoint(
     chat_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Unignore a chat.
@@ -363,7 +414,7 @@ async def unignore_chat_endpoint(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error unignoring chat {chat_id}: {str(e)}")
+        logger.error("Error unignoring chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to unignore chat: {str(e)}")
 
 
@@ -371,7 +422,7 @@ async def unignore_chat_endpoint(
 async def sync_chat(
     chat_id: str,
     full_sync: bool = Query(False, description="Perform full sync (all messages) instead of incremental"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Manually trigger message sync for a specific chat.
@@ -386,12 +437,7 @@ async def sync_chat(
     - Sync statistics
     """
     try:
-        # Check if chat exists
-        chat = await get_chat_by_id(db, chat_id)
-        if not chat:
-            raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
-        
-        # Perform sync
+        # Perform sync (the service checks the chat exists)
         stats = await sync_chat_messages(db, chat_id, full_sync=full_sync)
         
         return SyncResponse(
@@ -399,10 +445,10 @@ async def sync_chat(
             message=f"Successfully synced chat {chat_id}",
             stats=stats,
         )
-    except HTTPException:
-        raise
+    except ChatNotFound:
+        raise HTTPException(status_code=404, detail=f"Chat {chat_id} not found")
     except Exception as e:
-        logger.error(f"Error syncing chat {chat_id}: {str(e)}")
+        logger.error("Error syncing chat %s: %s", chat_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to sync chat: {str(e)}")
 
 
@@ -410,7 +456,7 @@ async def sync_chat(
 async def sync_all_chats(
     account_id: Optional[str] = Query(None, description="Filter by account ID"),
     full_sync: bool = Query(False, description="Perform full sync (all messages) instead of incremental"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Manually trigger sync for all chats and their messages.
@@ -433,15 +479,74 @@ async def sync_all_chats(
             stats=stats,
         )
     except Exception as e:
-        logger.error(f"Error syncing all chats: {str(e)}")
+        logger.error("Error syncing all chats: %s", e)
         raise HTTPException(status_code=500, detail=f"Failed to sync chats: {str(e)}")
 
 
-@router.get("/{chat_id}/attendee/{provider_id}")
+async def _fetch_chat_attendees(db: AsyncSession, chat_id: str) -> dict[str, AttendeeResponse]:
+    """Fetch (once per TTL) and store a chat's attendees from Unipile, keyed by provider_id."""
+    by_provider_id = _chat_attendees_cache.get(chat_id)
+    if by_provider_id is None:
+        client = get_unipile_client()
+        response = await client.list_chat_attendees(chat_id)
+        
+        # Cache every attendee of the chat in one round trip
+        by_provider_id = {
+            row.provider_id: _ATTENDEE_ADAPTER.validate_python(row, from_attributes=True)
+            for row in await upsert_attendees_bulk(db, response.items)
+        }
+        _chat_attendees_cache[chat_id] = by_provider_id
+    return by_provider_id
+
+
+@router.get("/{chat_id}/attendees", response_model=list[AttendeeResponse])
+async def get_chat_attendees(
+    chat_id: str,
+    provider_ids: list[str] = Query(..., description="Provider IDs to fetch (repeat the parameter or comma-separate)"),
+    db: AsyncSession = Depends(get_db, scope="function"),
+):
+    """
+    Get several attendees of a chat in one request.
+    
+    Attendees already stored are read with a single query; any that are
+    missing trigger at most one Unipile fetch for the chat. Unknown provider
+    IDs are omitted from the result.
+    
+    Path parameters:
+    - chat_id: Chat ID
+    
+    Query parameters:
+    - provider_ids: Provider IDs of the attendees
+    
+    Returns:
+    - List of attendee information including picture_url
+    """
+    try:
+        wanted = list(dict.fromkeys(
+            pid for value in provider_ids for pid in value.split(",") if pid
+        ))
+        
+        attendees = _ATTENDEE_LIST_ADAPTER.validate_python(
+            await get_attendees_by_provider_ids(db, wanted), from_attributes=True
+        )
+        
+        found = {attendee.provider_id for attendee in attendees}
+        missing = [pid for pid in wanted if pid not in found]
+        if missing:
+            by_provider_id = await _fetch_chat_attendees(db, chat_id)
+            attendees.extend(by_provider_id[pid] for pid in missing if pid in by_provider_id)
+        
+        return attendees
+    except Exception as e:
+        logger.error("Error fetching attendees for chat %s: %s", chat_id, e)
+        raise HTTPException(status_code=500, detail=f"Failed to fetch attendees: {str(e)}")
+
+
+@router.get("/{chat_id}/attendee/{provider_id}", response_model=AttendeeResponse)
 async def get_chat_attendee(
     chat_id: str,
     provider_id: str,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db, scope="function"),
 ):
     """
     Get attendee information including profile picture.
@@ -461,39 +566,19 @@ async def get_chat_attendee(
         
         if attendee:
             # Return cached data
-            return {
-                "id": attendee.id,
-                "provider_id": attendee.provider_id,
-                "name": attendee.name,
-                "picture_url": attendee.picture_url,
-                "profile_url": attendee.profile_url,
-                "is_self": attendee.is_self,
-            }
-        
-        # Not in cache, fetch from Unipile
-        client = get_unipile_client()
-        response = await client.list_chat_attendees(chat_id)
+            return _ATTENDEE_ADAPTER.validate_python(attendee, from_attributes=True)
         
-        # Find the specific attendee
-        for attendee_data in response.items:
-            if attendee_data.provider_id == provider_id:
-                # Cache it
-                cached_attendee = await upsert_attendee(db, attendee_data)
-                
-                return {
-                    "id": cached_attendee.id,
-                    "provider_id": cached_attendee.provider_id,
-                    "name": cached_attendee.name,
-                    "picture_url": cached_attendee.picture_url,
-                    "profile_url": cached_attendee.profile_url,
-                    "is_self": cached_attendee.is_self,
-                }
+        # Not in the database, fetch the chat's attendees from Unipile (once per TTL)
+        by_provider_id = await _fetch_chat_attendees(db, chat_id)
+        attendee_response = by_provider_id.get(provider_id)
+        if attendee_response is not None:
+            return attendee_response
         
         raise HTTPException(status_code=404, detail=f"Attendee {provider_id} not found in chat {chat_id}")
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching attendee {provider_id}: {str(e)}")
+        logger.error("Error fetching attendee %s: %s", provider_id, e)
         raise HTTPException(status_code=500, detail=f"Failed to fetch attendee: {str(e)}")
 
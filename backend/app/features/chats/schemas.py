@@ -1,7 +1,7 @@
 """Pydantic schemas for chats API."""
 from typing import Optional, Any, Literal
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 AssistMode = Literal["manual", "ai-assisted", "autopilot"]
@@ -14,7 +14,7 @@ class ChatResponse(BaseModel):
     account_type: str
     provider_id: str
     name: Optional[str] = None
-    timestamp: Optional[str] = None
+    timestamp: Optional[datetime] = None
     unread_count: int
     is_read: bool
     is_ignored: bool
@@ -22,8 +22,7 @@ class ChatResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ChatListResponse(BaseModel):
@@ -32,6 +31,7 @@ class ChatListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
 
 
 class MessageResponse(BaseModel):
@@ -43,7 +43,7 @@ class MessageResponse(BaseModel):
     sender_id: str
     sender_attendee_id: str
     text: Optional[str] = None
-    timestamp: str
+    timestamp: datetime
     is_sender: int
     attachments: list[Any]
     reactions: list[dict[str, Any]]
@@ -56,8 +56,7 @@ class MessageResponse(BaseModel):
     sent_by_autopilot: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MessageListResponse(BaseModel):
@@ -66,6 +65,19 @@ class MessageListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = None
+
+
+class AttendeeResponse(BaseModel):
+    """Response model for a chat attendee."""
+    id: str
+    provider_id: str
+    name: str
+    picture_url: Optional[str] = None
+    profile_url: Optional[str] = None
+    is_self: int
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MarkReadRequest(BaseModel):
@@ -1,7 +1,7 @@
 """WebSocket routes for realtime message delivery."""
 import logging
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, WebSocket
 
 from app.services import realtime
 
@@ -10,15 +10,23 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    """
+    Return once the client disconnects.
+    
+    Liveness is handled by Uvicorn's protocol-level ping/pong, so client frames
+    are discarded via raw receive() without being decoded.
+    """
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
 @router.websocket("/ws/messages")
 async def messages_socket(websocket: WebSocket):
     """Stream message events to connected clients."""
     await realtime.manager.connect(websocket)
     try:
-        while True:
-            # Keep the connection alive; future versions can act on incoming events.
-            await websocket.receive_text()
-    except WebSocketDisconnect:
+        await _wait_for_disconnect(websocket)
         logger.info("WebSocket disconnected by client")
     except Exception as exc:
         logger.error("WebSocket error: %s", exc)
@@ -1,4 +1,10 @@
-from .client import get_unipile_client, list_all_chats, list_chat_messages, send_message
+from .client import (
+    close_unipile_client,
+    get_unipile_client,
+    list_all_chats,
+    list_chat_messages,
+    send_message,
+)
 from .schemas import (
     Chat,
     ChatListResponse,
@@ -10,6 +16,7 @@ from .schemas import (
 from .router import router as unipile_router
 
 __all__ = [
+    "close_unipile_client",
     "get_unipile_client",
     "list_all_chats",
     "list_chat_messages",
@@ -1,11 +1,14 @@
-from typing import Optional, BinaryIO
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, BinaryIO, TypeVar
 import httpx
-from app.core.config import get_settings
+from pydantic import BaseModel
+from app.core.cache import TTLCache
+from app.core.config import settings
 from .schemas import (
-    ChatListResponse,
     Chat,
-    MessageListResponse,
+    ChatListResponse,
     Message,
+    MessageListResponse,
     ChatAttendeeListResponse,
     MessageSentResponse,
     WebhookCreateRequest,
@@ -13,26 +16,114 @@ from .schemas import (
     WebhookListResponse,
 )
 
+ResponseT = TypeVar("ResponseT", bound=BaseModel)
+
+# How long identical list requests are answered from memory
+RESPONSE_CACHE_TTL = 5
+
+# Default number of in-flight requests for batch helpers
+BATCH_CONCURRENCY = 10
+
+
+def _present(pairs: tuple[tuple[str, object], ...]) -> dict:
+    """Keep the (name, value) pairs that were actually given (not None or empty)."""
+    return {key: value for key, value in pairs if value is not None and value != ""}
+
+
+async def _iter_pages(
+    fetch_page: Callable[[Optional[str]], Awaitable[Any]],
+) -> AsyncIterator[Any]:
+    """
+    Yield the items of each page from `fetch_page(cursor)`, following cursors.
+
+    The next page is requested as soon as the current one arrives, so its
+    round trip overlaps with the consumer working through the current items.
+    Lookahead is one page; an abandoned iteration cancels the pending fetch.
+    """
+    next_page: Optional[asyncio.Task] = None
+    try:
+        page = await fetch_page(None)
+        while True:
+            if page.cursor:
+                next_page = asyncio.create_task(fetch_page(page.cursor))
+            for item in page.items:
+                yield item
+            if next_page is None:
+                return
+            page = await next_page
+            next_page = None
+    finally:
+        if next_page is not None:
+            next_page.cancel()
+
 
 class UnipileClient:
     """
     Client for interacting with the Unipile API.
+
+    Requests share one httpx.AsyncClient, so connections to Unipile are kept
+    alive and reused instead of paying a TCP/TLS handshake per call. Close it
+    with `await client.close()` or use the client as an async context manager.
     """
 
-    def __init__(self, base_url: str, api_key: str):
+    def __init__(self, base_url: str, api_key: str, http2: bool = False):
         """
         Initialize the Unipile client.
 
         Args:
             base_url: The base URL for the Unipile API (DSN)
             api_key: The API key for authentication
+            http2: Negotiate HTTP/2 so concurrent requests share one connection
+                (needs the httpx[http2] extra installed)
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
-        self.headers = {
-            "X-API-KEY": api_key,
-            "Content-Type": "application/json",
-        }
+        # Content-Type is left to httpx per request: JSON bodies set it and
+        # multipart uploads need their own boundary
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"X-API-KEY": api_key},
+            timeout=30.0,
+            http2=http2,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        )
+        # Parsed list responses keyed by (path, params). Cached models are shared
+        # between callers and must not be mutated.
+        self._response_cache: TTLCache[tuple, BaseModel] = TTLCache(
+            maxsize=512, ttl=RESPONSE_CACHE_TTL
+        )
+
+    async def _get(
+        self,
+        path: str,
+        model: type[ResponseT],
+        params: Optional[dict] = None,
+        use_cache: bool = True,
+    ) -> ResponseT:
+        """GET `path` and validate the body as `model`, reusing a recent identical response."""
+        key = (path, tuple(sorted(params.items())) if params else ())
+        if use_cache:
+            cached = self._response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        response = await self._client.get(path, params=params)
+        response.raise_for_status()
+
+        # Parse and validate the raw body in one pydantic-core pass
+        parsed = model.model_validate_json(response.content)
+        self._response_cache[key] = parsed
+        return parsed
+
+    async def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "UnipileClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
 
     async def list_all_chats(
         self,
@@ -43,6 +134,7 @@ class UnipileClient:
         limit: Optional[int] = None,
         account_type: Optional[str] = None,
         account_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> ChatListResponse:
         """
         List all chats from Unipile API.
@@ -55,6 +147,8 @@ class UnipileClient:
             limit: Limit number of items (1-250)
             account_type: Filter by provider (WHATSAPP, LINKEDIN, etc.)
             account_id: Filter by account ID (comma-separated list)
+            use_cache: Reuse an identical request's response from the last few seconds.
+                Pass False when the result must reflect the latest state (e.g. syncs).
 
         Returns:
             ChatListResponse containing simplified chat objects
@@ -64,55 +158,18 @@ class UnipileClient:
             httpx.RequestError: If there's a network/connection error
         """
         # Build query parameters
-        params = {}
-        if unread is not None:
-            params["unread"] = str(unread).lower()
-        if cursor:
-            params["cursor"] = cursor
-        if before:
-            params["before"] = before
-        if after:
-            params["after"] = after
-        if limit is not None:
-            params["limit"] = limit
-        if account_type:
-            params["account_type"] = account_type
-        if account_id:
-            params["account_id"] = account_id
-
-        url = f"{self.base_url}/api/v1/chats"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            # Extract only the fields we care about
-            filtered_items = []
-            for item in data.get("items", []):
-                chat = Chat(
-                    object=item.get("object"),
-                    id=item.get("id"),
-                    account_id=item.get("account_id"),
-                    account_type=item.get("account_type"),
-                    provider_id=item.get("provider_id"),
-                    name=item.get("name"),
-                    timestamp=item.get("timestamp"),
-                    unread_count=item.get("unread_count", 0),
-                    unread=item.get("unread_count", 0) > 0,
-                )
-                filtered_items.append(chat)
-
-            return ChatListResponse(
-                object=data.get("object"),
-                items=filtered_items,
-                cursor=data.get("cursor"),
-            )
+        params = _present((
+            ("unread", None if unread is None else str(unread).lower()),
+            ("cursor", cursor),
+            ("before", before),
+            ("after", after),
+            ("limit", limit),
+            ("account_type", account_type),
+            ("account_id", account_id),
+        ))
+
+        # Chat keeps only the fields we care about and derives unread itself
+        return await self._get("/api/v1/chats", ChatListResponse, params, use_cache)
 
     async def list_chat_messages(
         self,
@@ -122,6 +179,7 @@ class UnipileClient:
         after: Optional[str] = None,
         limit: Optional[int] = None,
         sender_id: Optional[str] = None,
+        use_cache: bool = True,
     ) -> MessageListResponse:
         """
         List all messages from a specific chat.
@@ -133,6 +191,8 @@ class UnipileClient:
             after: Filter items created after datetime (ISO 8601 UTC)
             limit: Limit number of items (1-250)
             sender_id: Filter messages from a specific sender
+            use_cache: Reuse an identical request's response from the last few seconds.
+                Pass False when the result must reflect the latest state (e.g. syncs).
 
         Returns:
             MessageListResponse containing message objects
@@ -142,51 +202,156 @@ class UnipileClient:
             httpx.RequestError: If there's a network/connection error
         """
         # Build query parameters
-        params = {}
-        if cursor:
-            params["cursor"] = cursor
-        if before:
-            params["before"] = before
-        if after:
-            params["after"] = after
-        if limit is not None:
-            params["limit"] = limit
-        if sender_id:
-            params["sender_id"] = sender_id
-
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/messages"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                params=params,
-                timeout=30.0,
+        params = _present((
+            ("cursor", cursor),
+            ("before", before),
+            ("after", after),
+            ("limit", limit),
+            ("sender_id", sender_id),
+        ))
+
+        return await self._get(
+            f"/api/v1/chats/{chat_id}/messages", MessageListResponse, params, use_cache
+        )
+
+    async def iter_chats(
+        self,
+        unread: Optional[bool] = None,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        account_type: Optional[str] = None,
+        account_id: Optional[str] = None,
+        page_limit: int = 250,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Chat]:
+        """
+        Iterate over every matching chat, following pagination cursors.
+
+        The next page is prefetched while the current one is consumed; at most
+        two pages are held, and breaking out of the loop stops further requests.
+
+        Args:
+            unread: Filter for unread/read chats only
+            before: Filter items created before datetime (ISO 8601 UTC)
+            after: Filter items created after datetime (ISO 8601 UTC)
+            account_type: Filter by provider (WHATSAPP, LINKEDIN, etc.)
+            account_id: Filter by account ID (comma-separated list)
+            page_limit: Items requested per page (1-250)
+            use_cache: Reuse identical responses from the last few seconds
+
+        Yields:
+            Chat objects
+        """
+        def fetch_page(cursor: Optional[str]) -> Awaitable[ChatListResponse]:
+            return self.list_all_chats(
+                unread=unread,
+                cursor=cursor,
+                before=before,
+                after=after,
+                limit=page_limit,
+                account_type=account_type,
+                account_id=account_id,
+                use_cache=use_cache,
             )
-            response.raise_for_status()
-            data = response.json()
-
-            # Parse messages
-            messages = []
-            for item in data.get("items", []):
-                message = Message(**item)
-                messages.append(message)
-
-            return MessageListResponse(
-                object=data.get("object"),
-                items=messages,
-                cursor=data.get("cursor"),
+
+        async for chat in _iter_pages(fetch_page):
+            yield chat
+
+    async def iter_messages(
+        self,
+        chat_id: str,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        sender_id: Optional[str] = None,
+        page_limit: int = 250,
+        use_cache: bool = True,
+    ) -> AsyncIterator[Message]:
+        """
+        Iterate over every message in a chat, following pagination cursors.
+
+        The next page is prefetched while the current one is consumed; at most
+        two pages are held, and breaking out of the loop stops further requests.
+
+        Args:
+            chat_id: The id of the chat related to requested messages
+            before: Filter items created before datetime (ISO 8601 UTC)
+            after: Filter items created after datetime (ISO 8601 UTC)
+            sender_id: Filter messages from a specific sender
+            page_limit: Items requested per page (1-250)
+            use_cache: Reuse identical responses from the last few seconds
+
+        Yields:
+            Message objects
+        """
+        def fetch_page(cursor: Optional[str]) -> Awaitable[MessageListResponse]:
+            return self.list_chat_messages(
+                chat_id,
+                cursor=cursor,
+                before=before,
+                after=after,
+                limit=page_limit,
+                sender_id=sender_id,
+                use_cache=use_cache,
             )
 
+        async for message in _iter_pages(fetch_page):
+            yield message
+
+    async def list_messages_for_chats(
+        self,
+        chat_ids: list[str],
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+        use_cache: bool = True,
+        concurrency: int = BATCH_CONCURRENCY,
+    ) -> dict[str, MessageListResponse]:
+        """
+        Fetch the first page of messages for several chats concurrently.
+
+        At most `concurrency` requests are in flight at once, so a large batch
+        does not exhaust the connection pool or trip Unipile's rate limits.
+
+        Args:
+            chat_ids: Chats to fetch messages for
+            before: Filter items created before datetime (ISO 8601 UTC)
+            after: Filter items created after datetime (ISO 8601 UTC)
+            limit: Limit number of items per chat (1-250)
+            use_cache: Reuse identical responses from the last few seconds
+            concurrency: Maximum number of concurrent requests
+
+        Returns:
+            Mapping of chat_id to its MessageListResponse
+
+        Raises:
+            httpx.HTTPStatusError: If the API returns an error status for any chat
+            httpx.RequestError: If there's a network/connection error
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(chat_id: str) -> tuple[str, MessageListResponse]:
+            async with semaphore:
+                return chat_id, await self.list_chat_messages(
+                    chat_id,
+                    before=before,
+                    after=after,
+                    limit=limit,
+                    use_cache=use_cache,
+                )
+
+        return dict(await asyncio.gather(*(fetch(chat_id) for chat_id in chat_ids)))
+
     async def list_chat_attendees(
         self,
         chat_id: str,
+        use_cache: bool = True,
     ) -> ChatAttendeeListResponse:
         """
         List all attendees from a chat.
 
         Args:
             chat_id: The id of the chat related to requested attendees
+            use_cache: Reuse the response from the last few seconds if there is one
 
         Returns:
             ChatAttendeeListResponse containing attendee information including picture_url
@@ -195,18 +360,9 @@ class UnipileClient:
             httpx.HTTPStatusError: If the API returns an error status
             httpx.RequestError: If there's a network/connection error
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/attendees"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            return ChatAttendeeListResponse(**data)
+        return await self._get(
+            f"/api/v1/chats/{chat_id}/attendees", ChatAttendeeListResponse, use_cache=use_cache
+        )
 
     async def send_message(
         self,
@@ -241,20 +397,14 @@ class UnipileClient:
             httpx.HTTPStatusError: If the API returns an error status
             httpx.RequestError: If there's a network/connection error
         """
-        url = f"{self.base_url}/api/v1/chats/{chat_id}/messages"
-
         # Build form data
-        data = {}
-        if text:
-            data["text"] = text
-        if account_id:
-            data["account_id"] = account_id
-        if thread_id:
-            data["thread_id"] = thread_id
-        if quote_id:
-            data["quote_id"] = quote_id
-        if typing_duration:
-            data["typing_duration"] = typing_duration
+        data = _present((
+            ("text", text),
+            ("account_id", account_id),
+            ("thread_id", thread_id),
+            ("quote_id", quote_id),
+            ("typing_duration", typing_duration),
+        ))
 
         # Build files dictionary
         files = {}
@@ -266,22 +416,17 @@ class UnipileClient:
             # For multiple files with same key, httpx expects list of tuples
             files["attachments"] = attachments
 
-        # Remove Content-Type from headers for multipart/form-data
-        # httpx will set it automatically with boundary
-        headers = {k: v for k, v in self.headers.items() if k.lower() != "content-type"}
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=headers,
-                data=data,
-                files=files if files else None,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            response_data = response.json()
+        # No Content-Type header: httpx sets multipart/form-data with its boundary
+        response = await self._client.post(
+            f"/api/v1/chats/{chat_id}/messages",
+            data=data,
+            files=files if files else None,
+        )
+        response.raise_for_status()
+        # Cached message lists no longer reflect the chat
+        self._response_cache.clear()
 
-            return MessageSentResponse(**response_data)
+        return MessageSentResponse.model_validate_json(response.content)
 
     async def create_webhook(
         self,
@@ -312,8 +457,6 @@ class UnipileClient:
             httpx.HTTPStatusError: If the API returns an error status
             httpx.RequestError: If there's a network/connection error
         """
-        url = f"{self.base_url}/api/v1/webhooks"
-
         # Set default events if not provided
         if events is None:
             events = ["message_received"]
@@ -328,22 +471,22 @@ class UnipileClient:
             events=events,
         )
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url,
-                headers=self.headers,
-                json=webhook_data.model_dump(exclude_none=True),
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self._client.post(
+            "/api/v1/webhooks",
+            json=webhook_data.model_dump(exclude_none=True),
+        )
+        response.raise_for_status()
+        self._response_cache.clear()
 
-            return WebhookCreatedResponse(**data)
+        return WebhookCreatedResponse.model_validate_json(response.content)
 
-    async def list_webhooks(self) -> WebhookListResponse:
+    async def list_webhooks(self, use_cache: bool = True) -> WebhookListResponse:
         """
         List all webhooks configured in Unipile.
 
+        Args:
+            use_cache: Reuse the response from the last few seconds if there is one
+
         Returns:
             WebhookListResponse containing list of webhooks
 
@@ -351,18 +494,7 @@ class UnipileClient:
             httpx.HTTPStatusError: If the API returns an error status
             httpx.RequestError: If there's a network/connection error
         """
-        url = f"{self.base_url}/api/v1/webhooks"
-
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                url,
-                headers=self.headers,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            data = response.json()
-
-            return WebhookListResponse(**data)
+        return await self._get("/api/v1/webhooks", WebhookListResponse, use_cache=use_cache)
 
     async def delete_webhook(self, webhook_id: str) -> dict:
         """
@@ -378,21 +510,21 @@ class UnipileClient:
             httpx.HTTPStatusError: If the API returns an error status
             httpx.RequestError: If there's a network/connection error
         """
-        url = f"{self.base_url}/api/v1/webhooks/{webhook_id}"
+        response = await self._client.delete(f"/api/v1/webhooks/{webhook_id}")
+        response.raise_for_status()
+        self._response_cache.clear()
+        return response.json()
 
-        async with httpx.AsyncClient() as client:
-            response = await client.delete(
-                url,
-                headers=self.headers,
-                timeout=30.0,
-            )
-            response.raise_for_status()
-            return response.json()
+
+_client: UnipileClient | None = None
 
 
 def get_unipile_client() -> UnipileClient:
     """
-    Factory function to create a UnipileClient instance with settings from config.
+    Return the shared UnipileClient configured from settings.
+
+    The instance (and its connection pool) is created on first use and reused
+    for the life of the process; close_unipile_client() releases it.
 
     Returns:
         Configured UnipileClient instance
@@ -400,7 +532,9 @@ def get_unipile_client() -> UnipileClient:
     Raises:
         ValueError: If UNIPILE_DSN or UNIPILE_API_KEY are not configured
     """
-    settings = get_settings()
+    global _client
+    if _client is not None:
+        return _client
 
     if not settings.unipile_dsn:
         raise ValueError("UNIPILE_DSN is not configured in environment variables")
@@ -408,10 +542,20 @@ def get_unipile_client() -> UnipileClient:
     if not settings.unipile_api_key:
         raise ValueError("UNIPILE_API_KEY is not configured in environment variables")
 
-    return UnipileClient(
+    _client = UnipileClient(
         base_url=settings.unipile_dsn,
         api_key=settings.unipile_api_key,
+        http2=settings.unipile_http2,
     )
+    return _client
+
+
+async def close_unipile_client() -> None:
+    """Close the shared client's connections; the next get_unipile_client() builds a new one."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
 
 
 async def list_all_chats(
@@ -422,6 +566,7 @@ async def list_all_chats(
     limit: Optional[int] = None,
     account_type: Optional[str] = None,
     account_id: Optional[str] = None,
+    use_cache: bool = True,
 ) -> ChatListResponse:
     """
     Convenience function to list all chats using the configured client.
@@ -437,6 +582,7 @@ async def list_all_chats(
         limit: Limit number of items (1-250)
         account_type: Filter by provider (WHATSAPP, LINKEDIN, etc.)
         account_id: Filter by account ID (comma-separated list)
+        use_cache: Reuse an identical request's response from the last few seconds
 
     Returns:
         ChatListResponse containing simplified chat objects
@@ -464,6 +610,7 @@ async def list_all_chats(
         limit=limit,
         account_type=account_type,
         account_id=account_id,
+        use_cache=use_cache,
     )
 
 
@@ -474,6 +621,7 @@ async def list_chat_messages(
     after: Optional[str] = None,
     limit: Optional[int] = None,
     sender_id: Optional[str] = None,
+    use_cache: bool = True,
 ) -> MessageListResponse:
     """
     Convenience function to list messages from a chat using the configured client.
@@ -488,6 +636,7 @@ async def list_chat_messages(
         after: Filter items created after datetime (ISO 8601 UTC)
         limit: Limit number of items (1-250)
         sender_id: Filter messages from a specific sender
+        use_cache: Reuse an identical request's response from the last few seconds
 
     Returns:
         MessageListResponse containing message objects
@@ -514,6 +663,7 @@ async def list_chat_messages(
         after=after,
         limit=limit,
         sender_id=sender_id,
+        use_cache=use_cache,
     )
 
 
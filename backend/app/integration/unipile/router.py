@@ -1,6 +1,6 @@
 from typing import Optional, Any
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException, Query, Path, File, Form, UploadFile, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from .client import list_all_chats, list_chat_messages, send_message, get_unipile_client
@@ -15,6 +15,8 @@ from app.services.realtime import broadcast_new_message, serialize_message
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
 
 router = APIRouter(prefix="/api/unipile", tags=["Unipile Integration"])
 
@@ -365,7 +367,7 @@ async def send_message_in_chat(
             typing_duration=typing_duration,
         )
         
-        sent_timestamp = datetime.utcnow().isoformat() + 'Z'
+        sent_timestamp = datetime.now(_UTC)
 
         # Add message to pending queue for batch processing
         try:
@@ -1,5 +1,6 @@
+from datetime import datetime
 from typing import Optional, Any, Union
-from pydantic import BaseModel, field_validator, Field, AliasChoices
+from pydantic import BaseModel, ConfigDict, computed_field, field_validator, Field, AliasChoices
 
 
 # Chat Attendee Types
@@ -40,15 +41,22 @@ class Chat(BaseModel):
     """
     Simplified Chat model containing only the essential fields.
     """
+    # The rest of the API's chat payload is dropped during validation
+    model_config = ConfigDict(extra="ignore")
+
     object: str
     id: str
     account_id: str
     account_type: str
     provider_id: str
     name: Optional[str] = None
-    timestamp: Optional[str] = None
-    unread_count: int
-    unread: Optional[bool] = None
+    timestamp: Optional[datetime] = None
+    unread_count: int = 0
+
+    @computed_field
+    @property
+    def unread(self) -> bool:
+        return self.unread_count > 0
 
 
 class ChatListResponse(BaseModel):
@@ -193,7 +201,7 @@ class Message(BaseModel):
     sender_id: str
     sender_attendee_id: str
     text: Optional[str] = None
-    timestamp: str
+    timestamp: datetime
     is_sender: int  # 0 or 1
     attachments: list[Any]  # List of attachment objects
     reactions: list[Reaction]
@@ -350,7 +358,7 @@ class WebhookMessagePayload(BaseModel):
     account_type: str
     account_info: Optional[WebhookAccountInfo] = None
     chat_id: str
-    timestamp: str
+    timestamp: datetime
     webhook_name: Optional[str] = None
     message_id: str
     message: Optional[str] = None  # Message text
@@ -8,14 +8,15 @@ from apscheduler.triggers.interval import IntervalTrigger
 
 from app.features.auth import auth_router
 from app.features.example import example_router
-from app.integration.unipile import unipile_router
+from app.integration.unipile import close_unipile_client, unipile_router
 from app.features.chats.router import router as chats_router
 from app.features.webhooks import webhook_router
 from app.features.realtime.router import router as realtime_router
-from app.db.base import init_db, AsyncSessionLocal
+from app.db.base import init_db, warm_up_pool, engine, AsyncSessionLocal
 from app.services.message_sync import sync_all_chat_messages
 from app.services.pending_message_processor import process_pending_messages
 from app.services.webhook_manager import ensure_webhook_exists
+from app.services.webhook_queue import start_webhook_workers, stop_webhook_workers
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +43,10 @@ async def lifespan(app: FastAPI):
         logger.info("Initializing database tables...")
         await init_db()
         logger.info("Database tables initialized successfully")
+        await warm_up_pool()
+        
+        # Start consumers before registering the webhook so no events are dropped
+        start_webhook_workers()
         
         # Ensure webhook exists in Unipile for real-time message ingestion
         logger.info("Ensuring webhook exists in Unipile...")
@@ -87,6 +92,9 @@ async def lifespan(app: FastAPI):
     logger.info("Shutting down application...")
     scheduler.shutdown()
     logger.info("Background scheduler stopped")
+    await stop_webhook_workers()
+    await close_unipile_client()
+    await engine.dispose()
 
 
 app = FastAPI(title="SetDM API", lifespan=lifespan)
@@ -7,7 +7,7 @@ from typing import Sequence
 
 from openai import AsyncOpenAI, OpenAIError
 
-from app.core.config import get_settings
+from app.core.config import settings
 from app.db.models import ChatModel, MessageModel
 
 logger = logging.getLogger(__name__)
@@ -22,7 +22,6 @@ class AISuggestionError(RuntimeError):
 def _get_openai_client() -> AsyncOpenAI:
     """Return a cached AsyncOpenAI client."""
     global _client
-    settings = get_settings()
     if not settings.openai_api_key:
         raise AISuggestionError(
             "OpenAI API key is not configured. Please set OPENAI_API_KEY in the backend environment."
@@ -61,7 +60,6 @@ async def generate_sales_response(
     if not prompt or not prompt.strip():
         raise AISuggestionError("Prompt cannot be empty.")
 
-    settings = get_settings()
     effective_limit = history_limit or settings.openai_history_limit or 20
     transcript = _format_history(messages, effective_limit)
 
@@ -2,11 +2,11 @@
 from __future__ import annotations
 
 import logging
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import get_settings
+from app.core.config import settings
 from app.db.crud import (
     create_pending_message,
     get_chat_by_id,
@@ -21,6 +21,8 @@ from app.services.realtime import broadcast_new_message
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+
 
 async def maybe_send_autopilot_reply(
     db: AsyncSession,
@@ -47,7 +49,6 @@ async def maybe_send_autopilot_reply(
     if not latest_message or latest_message.id != incoming_message.id:
         return
     
-    settings = get_settings()
     autopilot_prompt = (settings.autopilot_prompt or "").strip()
     if not autopilot_prompt:
         logger.warning("Autopilot prompt is empty; skipping auto reply for chat %s", chat.id)
@@ -92,7 +93,7 @@ async def maybe_send_autopilot_reply(
         logger.warning("Autopilot reply sent for chat %s but no message_id returned", chat.id)
         return
 
-    timestamp = datetime.utcnow().isoformat() + "Z"
+    timestamp = datetime.now(_UTC)
 
     persisted_message: MessageModel | None = None
     try:
@@ -1,21 +1,42 @@
 """Message synchronization service for syncing with Unipile API."""
+import asyncio
 import logging
 from typing import Optional
-from datetime import datetime, timedelta
+from datetime import timedelta, timezone
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.base import AsyncSessionLocal
 from app.integration.unipile.client import get_unipile_client
 from app.db.crud import (
+    get_chat_by_id,
     get_or_create_chat,
+    iter_chat_ids,
     get_latest_message_timestamp,
-    create_message,
+    create_messages_bulk,
+    bulk_copy_messages,
     update_chat_timestamp,
     mark_chat_as_unread,
 )
 
 logger = logging.getLogger(__name__)
 
+# Number of fetched messages accumulated before flushing them to the database
+MESSAGE_BATCH_SIZE = 500
+
+# Opt-in: load a chat's first import with COPY instead of INSERT. COPY has no
+# conflict handling, so a webhook racing the import makes it fail; the COPY
+# then rolls back to its savepoint and the batch is retried with INSERT.
+USE_COPY_FOR_INITIAL_IMPORT = False
+
+# Chats whose messages are synced concurrently by sync_all_chat_messages.
+# Bounded to stay within Unipile rate limits and the DB pool size.
+MESSAGE_SYNC_CONCURRENCY = 8
+
+
+class ChatNotFound(LookupError):
+    """Raised when syncing messages for a chat that is not stored locally."""
+
 
 async def sync_all_chats(db: AsyncSession, account_id: Optional[str] = None) -> dict:
     """
@@ -57,6 +78,7 @@ async def sync_all_chats(db: AsyncSession, account_id: Optional[str] = None) ->
                 cursor=cursor,
                 account_id=account_id,
                 limit=100,  # Max items per request
+                use_cache=False,
             )
             
             logger.info(f"Fetched {len(response.items)} chats from Unipile")
@@ -64,7 +86,6 @@ async def sync_all_chats(db: AsyncSession, account_id: Optional[str] = None) ->
             # Process each chat
             for chat_data in response.items:
                 # Check if chat exists
-                from app.db.crud import get_chat_by_id
                 existing_chat = await get_chat_by_id(db, chat_data.id)
                 
                 # Check if chat needs message sync
@@ -129,9 +150,17 @@ async def sync_chat_messages(
             "messages_fetched": int,
             "messages_created": int,
             "new_unread_messages": int,
-            "latest_timestamp": str or None,
+            "latest_timestamp": datetime or None,
         }
+    
+    Raises:
+        ChatNotFound: If the chat does not exist in the database
     """
+    # Served from the chat cache / identity map in the common case, so callers
+    # no longer need their own existence check first
+    if await get_chat_by_id(db, chat_id) is None:
+        raise ChatNotFound(chat_id)
+    
     client = get_unipile_client()
     stats = {
         "messages_fetched": 0,
@@ -143,25 +172,50 @@ async def sync_chat_messages(
     try:
         # Get last message timestamp for incremental sync
         after_timestamp = None
+        last_timestamp = await get_latest_message_timestamp(db, chat_id)
+        # A chat with no stored messages is an initial import and can use COPY
+        use_copy = USE_COPY_FOR_INITIAL_IMPORT and last_timestamp is None
         if not full_sync:
-            last_timestamp = await get_latest_message_timestamp(db, chat_id)
             if last_timestamp:
                 # Subtract 1 day for redundancy to catch any missed messages
-                try:
-                    last_dt = datetime.fromisoformat(last_timestamp.replace('Z', '+00:00'))
-                    sync_from_dt = last_dt - timedelta(days=1)
-                    after_timestamp = sync_from_dt.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
-                    logger.info(f"Performing incremental sync for chat {chat_id} from {after_timestamp} (1 day before last message at {last_timestamp})")
-                except (ValueError, AttributeError) as e:
-                    # If timestamp parsing fails, use the original timestamp
-                    logger.warning(f"Failed to parse timestamp {last_timestamp}, using as-is: {e}")
-                    after_timestamp = last_timestamp
-                    logger.info(f"Performing incremental sync for chat {chat_id} after {after_timestamp}")
+                sync_from_dt = last_timestamp.astimezone(timezone.utc) - timedelta(days=1)
+                after_timestamp = sync_from_dt.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+                logger.info(f"Performing incremental sync for chat {chat_id} from {after_timestamp} (1 day before last message at {last_timestamp.isoformat()})")
         
         cursor = None
         latest_timestamp = None
         has_new_unread = False
         pages_fetched = 0
+        message_batch = []
+        
+        async def flush_batch() -> None:
+            nonlocal latest_timestamp, has_new_unread, use_copy
+            created = None
+            if use_copy:
+                try:
+                    rows = await bulk_copy_messages(db, message_batch)
+                    created = [(row["is_sender"], row["timestamp"]) for row in rows]
+                except Exception as e:
+                    # e.g. a webhook stored one of these messages first. Only the
+                    # COPY's savepoint was rolled back; the session is intact.
+                    use_copy = False
+                    logger.warning(f"COPY import failed for chat {chat_id}, falling back to INSERT: {str(e)}")
+            if created is None:
+                created_messages = await create_messages_bulk(db, message_batch)
+                created = [(m.is_sender, m.timestamp) for m in created_messages]
+            message_batch.clear()
+            
+            for is_sender, timestamp in created:
+                stats["messages_created"] += 1
+                
+                # Track if there are new messages from other users (not sender)
+                if is_sender == 0:
+                    has_new_unread = True
+                    stats["new_unread_messages"] += 1
+                
+                # Track latest timestamp
+                if not latest_timestamp or timestamp > latest_timestamp:
+                    latest_timestamp = timestamp
         
         while True:
             # Fetch messages from Unipile
@@ -170,28 +224,17 @@ async def sync_chat_messages(
                 cursor=cursor,
                 after=after_timestamp,
                 limit=100,  # Max items per request
+                use_cache=False,
             )
             
             pages_fetched += 1
             logger.info(f"Fetched {len(response.items)} messages for chat {chat_id} (page {pages_fetched})")
             stats["messages_fetched"] += len(response.items)
             
-            # Process each message
-            for message_data in response.items:
-                # Try to create message (will return None if duplicate)
-                created_message = await create_message(db, message_data)
-                
-                if created_message:
-                    stats["messages_created"] += 1
-                    
-                    # Track if there are new messages from other users (not sender)
-                    if message_data.is_sender == 0:
-                        has_new_unread = True
-                        stats["new_unread_messages"] += 1
-                    
-                    # Track latest timestamp
-                    if not latest_timestamp or message_data.timestamp > latest_timestamp:
-                        latest_timestamp = message_data.timestamp
+            # Accumulate messages and write them in batches (duplicates are skipped)
+            message_batch.extend(response.items)
+            if len(message_batch) >= MESSAGE_BATCH_SIZE:
+                await flush_batch()
             
             # Check if we should continue fetching
             if max_pages and pages_fetched >= max_pages:
@@ -204,6 +247,9 @@ async def sync_chat_messages(
             else:
                 break  # No more pages
         
+        if message_batch:
+            await flush_batch()
+        
         # Update chat timestamp if we got new messages
         if latest_timestamp:
             await update_chat_timestamp(db, chat_id, latest_timestamp)
@@ -264,30 +310,50 @@ async def sync_all_chat_messages(
         "chats_with_errors": 0,
     }
     
-    # Get list of chat IDs that need message sync
-    chats_to_sync = chat_stats["chats_with_new_messages"]
+    # Sync messages only for chats that need it. Each chat runs in its own
+    # session because an AsyncSession cannot be shared across concurrent tasks.
+    # A slot is taken before a chat's task is created, so at most
+    # MESSAGE_SYNC_CONCURRENCY chats are in flight or pending at any time.
+    semaphore = asyncio.Semaphore(MESSAGE_SYNC_CONCURRENCY)
+    running: set[asyncio.Task] = set()
+    
+    async def sync_one(chat_id: str) -> None:
+        try:
+            async with AsyncSessionLocal() as chat_db:
+                message_stats = await sync_chat_messages(
+                    chat_db, chat_id, full_sync=full_sync, max_pages=max_pages_per_chat
+                )
+        except Exception as e:
+            logger.error(f"Failed to sync messages for chat {chat_id}: {str(e)}")
+            overall_stats["chats_with_errors"] += 1
+            return
+        finally:
+            semaphore.release()
+        overall_stats["total_messages_created"] += message_stats["messages_created"]
+        overall_stats["total_unread_messages"] += message_stats["new_unread_messages"]
+        overall_stats["chats_checked_for_messages"] += 1
+    
+    async def schedule(chat_id: str) -> None:
+        await semaphore.acquire()
+        task = asyncio.create_task(sync_one(chat_id))
+        running.add(task)
+        task.add_done_callback(running.discard)
     
     if full_sync:
-        # If full sync requested, sync all chats
-        from app.db.crud import get_all_chats
-        all_chats = await get_all_chats(db, account_id=account_id, limit=1000)
-        chats_to_sync = [chat.id for chat in all_chats]
-        logger.info(f"Full sync requested - will sync messages for all {len(chats_to_sync)} chats")
+        # If full sync requested, sync all chats. IDs are streamed from a
+        # server-side cursor and each chat starts syncing as its ID arrives.
+        logger.info("Full sync requested - syncing messages for all chats")
+        async for chat_id in iter_chat_ids(db, account_id=account_id):
+            await schedule(chat_id)
     else:
+        # Get list of chat IDs that need message sync
+        chats_to_sync = chat_stats["chats_with_new_messages"]
         logger.info(f"Incremental sync - will sync messages for {len(chats_to_sync)} chats with new messages")
         overall_stats["chats_skipped"] = chat_stats["chats_synced"] - len(chats_to_sync)
+        for chat_id in chats_to_sync:
+            await schedule(chat_id)
     
-    # Sync messages only for chats that need it
-    for chat_id in chats_to_sync:
-        try:
-            message_stats = await sync_chat_messages(db, chat_id, full_sync=full_sync, max_pages=max_pages_per_chat)
-            overall_stats["total_messages_created"] += message_stats["messages_created"]
-            overall_stats["total_unread_messages"] += message_stats["new_unread_messages"]
-            overall_stats["chats_checked_for_messages"] += 1
-        except Exception as e:
-            logger.error(f"Failed to sync messages for chat {chat_id}: {str(e)}")
-            overall_stats["chats_with_errors"] += 1
-            continue
+    await asyncio.gather(*running)
     
     logger.info(f"Full sync completed: {overall_stats}")
     return overall_stats
@@ -9,7 +9,7 @@ from app.db.crud import (
     get_pending_messages,
     mark_pending_as_synced,
     increment_sync_attempts,
-    get_message_by_id,
+    message_exists,
     delete_synced_pending_messages,
 )
 from app.services.message_sync import sync_chat_messages
@@ -59,9 +59,7 @@ async def process_pending_messages():
                     # Check which pending messages are now synced
                     for pending_msg in messages:
                         # Check if message exists in messages table
-                        synced_message = await get_message_by_id(db, pending_msg.message_id)
-                        
-                        if synced_message:
+                        if await message_exists(db, pending_msg.message_id):
                             # Message successfully synced
                             await mark_pending_as_synced(db, pending_msg.message_id)
                             logger.info(f"Message {pending_msg.message_id} successfully synced")
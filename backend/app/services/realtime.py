@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from typing import Any, Dict, Optional, Set
 
@@ -46,19 +47,31 @@ class ConnectionManager:
 
     async def broadcast(self, message: Dict[str, Any]) -> None:
         """Send a JSON message to all active connections."""
+        # Encode once for every client instead of once per send_json() call
+        await self.broadcast_text(json.dumps(message, separators=(",", ":")))
+
+    async def broadcast_text(self, data: str) -> None:
+        """Send a pre-encoded text frame to all active connections concurrently."""
         connections = await self._snapshot()
         if not connections:
             return
 
         stale: Set[WebSocket] = set()
+        live = []
         for connection in connections:
             if connection.application_state != WebSocketState.CONNECTED:
                 stale.add(connection)
-                continue
-            try:
-                await connection.send_json(message)
-            except Exception as exc:
-                logger.warning("WebSocket send failed: %s", exc)
+            else:
+                live.append(connection)
+
+        # One slow or dead socket neither delays nor aborts the others
+        results = await asyncio.gather(
+            *(connection.send_text(data) for connection in live),
+            return_exceptions=True,
+        )
+        for connection, result in zip(live, results):
+            if isinstance(result, Exception):
+                logger.warning("WebSocket send failed: %s", result)
                 stale.add(connection)
 
         for connection in stale:
@@ -80,7 +93,7 @@ def serialize_message(message: MessageModel) -> Dict[str, Any]:
         "sender_id": message.sender_id,
         "sender_attendee_id": message.sender_attendee_id,
         "text": message.text,
-        "timestamp": message.timestamp,
+        "timestamp": message.timestamp.isoformat(),
         "is_sender": message.is_sender,
         "attachments": message.attachments or [],
         "reactions": message.reactions or [],
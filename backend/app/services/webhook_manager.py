@@ -3,7 +3,7 @@ import logging
 from typing import Optional
 
 from app.integration.unipile.client import get_unipile_client
-from app.core.config import get_settings
+from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +24,6 @@ async def ensure_webhook_exists(webhook_name: str = "setdm_messages") -> Optiona
     Raises:
         Exception: If webhook creation fails
     """
-    settings = get_settings()
-    
     # Check if webhook_base_url is configured
     if not settings.webhook_base_url:
         logger.warning(
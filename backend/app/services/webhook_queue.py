@@ -0,0 +1,196 @@
+"""In-process queue that decouples webhook acknowledgement from message processing."""
+import asyncio
+import logging
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.db.base import AsyncSessionLocal
+from app.db.models import MessageModel
+from app.db.crud import (
+    get_or_create_chat,
+    upsert_message_and_touch_chat,
+    get_chat_by_id,
+)
+from app.integration.unipile.schemas import Chat, Message, WebhookMessagePayload
+from app.services.realtime import broadcast_new_message
+from app.services.autopilot import maybe_send_autopilot_reply
+
+logger = logging.getLogger(__name__)
+
+# Number of concurrent consumers; each holds its own DB session while working
+WEBHOOK_WORKER_COUNT = 4
+
+# Bound on queued payloads. When full, the webhook route waits for space, which
+# applies backpressure to Unipile instead of growing memory without limit.
+WEBHOOK_QUEUE_MAXSIZE = 1000
+
+# Seconds to let workers drain the queue on shutdown before cancelling them
+WEBHOOK_DRAIN_TIMEOUT = 10
+
+# Message IDs handled recently, so Unipile retries and duplicate deliveries are
+# dropped without touching the database. Per process only; the messages primary
+# key still rejects any duplicate that slips through (e.g. after a restart).
+_recent_message_ids: TTLCache[str, bool] = TTLCache(maxsize=50_000, ttl=3600)
+
+_queue: asyncio.Queue[WebhookMessagePayload] = asyncio.Queue(maxsize=WEBHOOK_QUEUE_MAXSIZE)
+_workers: list[asyncio.Task] = []
+
+# Broadcast/autopilot follow-ups still running; held so the tasks are not
+# garbage-collected mid-flight and can be awaited on shutdown
+_follow_ups: set[asyncio.Task] = set()
+
+
+async def enqueue_webhook_message(payload: WebhookMessagePayload) -> None:
+    """Queue a validated webhook payload for background processing."""
+    await _queue.put(payload)
+
+
+def _spawn_follow_up(coro, name: str) -> None:
+    task = asyncio.create_task(coro, name=name)
+    _follow_ups.add(task)
+    task.add_done_callback(_follow_ups.discard)
+
+
+async def _run_autopilot(message: MessageModel) -> None:
+    """Run autopilot on its own session so the worker's connection is not held during the LLM call."""
+    try:
+        async with AsyncSessionLocal() as db:
+            await maybe_send_autopilot_reply(db, message)
+    except Exception:
+        logger.exception("Autopilot failed for message %s", message.id)
+
+
+async def _run_broadcast(message: MessageModel) -> None:
+    try:
+        await broadcast_new_message(message)
+    except Exception:
+        logger.exception("Broadcast failed for message %s", message.id)
+
+
+async def _worker(worker_id: int) -> None:
+    while True:
+        payload = await _queue.get()
+        try:
+            async with AsyncSessionLocal() as db:
+                await process_webhook_message(db, payload)
+            logger.info("Successfully processed webhook message: %s", payload.message_id)
+        except Exception:
+            logger.exception("Webhook worker %s failed on message %s", worker_id, payload.message_id)
+        finally:
+            _queue.task_done()
+
+
+def start_webhook_workers() -> None:
+    """Start the webhook consumers. Called once from the application lifespan."""
+    if _workers:
+        return
+    for worker_id in range(WEBHOOK_WORKER_COUNT):
+        _workers.append(asyncio.create_task(_worker(worker_id), name=f"webhook-worker-{worker_id}"))
+    logger.info("Started %d webhook workers", WEBHOOK_WORKER_COUNT)
+
+
+async def stop_webhook_workers() -> None:
+    """Give queued webhooks a chance to finish, then cancel the consumers."""
+    if not _workers:
+        return
+    try:
+        await asyncio.wait_for(_queue.join(), timeout=WEBHOOK_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning("Dropping %d queued webhook messages on shutdown", _queue.qsize())
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+    if _follow_ups:
+        _, pending = await asyncio.wait(list(_follow_ups), timeout=WEBHOOK_DRAIN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+
+
+async def process_webhook_message(db: AsyncSession, payload: WebhookMessagePayload):
+    """
+    Process a webhook message payload and save to database.
+
+    Args:
+        db: Database session
+        payload: Validated webhook payload
+    """
+    if payload.message_id in _recent_message_ids:
+        logger.info(f"Message {payload.message_id} was delivered recently, skipping")
+        return
+    # Claimed up front so a concurrent duplicate is skipped; released on failure
+    # so a retry can process it
+    _recent_message_ids[payload.message_id] = True
+    try:
+        await _store_webhook_message(db, payload)
+    except BaseException:
+        _recent_message_ids.pop(payload.message_id)
+        raise
+
+
+async def _store_webhook_message(db: AsyncSession, payload: WebhookMessagePayload) -> None:
+    # First, ensure the chat exists
+    # We need to fetch or create a basic chat record
+    chat = await get_chat_by_id(db, payload.chat_id)
+
+    if not chat:
+        # Create a minimal chat object from webhook data
+        chat_data = Chat(
+            object="Chat",
+            id=payload.chat_id,
+            account_id=payload.account_id,
+            account_type=payload.account_type,
+            provider_id=payload.provider_chat_id,
+            name=payload.sender.name if payload.sender else None,
+            timestamp=payload.timestamp,
+            unread_count=1,
+        )
+
+        await get_or_create_chat(db, chat_data)
+        logger.info(f"Created new chat from webhook: {payload.chat_id}")
+
+    # Convert webhook payload to Message schema
+    # Note: Webhook provides simplified data, so we'll use defaults for missing fields
+    # Use provider_id as sender_id to ensure consistency with chat_attendees table
+    message_data = Message(
+        object="Message",
+        id=payload.message_id,
+        account_id=payload.account_id,
+        chat_id=payload.chat_id,
+        chat_provider_id=payload.provider_chat_id,
+        provider_id=payload.provider_message_id,
+        sender_id=payload.sender.provider_id if payload.sender and payload.sender.provider_id else (payload.sender.id if payload.sender else ""),
+        sender_attendee_id=payload.sender.id if payload.sender else "",
+        text=payload.message,
+        timestamp=payload.timestamp,
+        is_sender=0,  # Webhooks are triggered for received messages, so is_sender=0
+        attachments=payload.attachments or [],
+        reactions=[],
+        seen=0,
+        seen_by={},
+        hidden=0,
+        deleted=0,
+        edited=0,
+        is_event=payload.is_event or 0,
+        delivered=1,
+        behavior=None,
+        original=payload.message or "",
+        quoted=payload.quoted,
+        message_type=payload.message_type,
+    )
+
+    # Create the message (skipped if duplicate); the same statement advances
+    # the chat timestamp and marks it unread (since this is a received message)
+    created_message = await upsert_message_and_touch_chat(db, message_data)
+
+    if created_message:
+        logger.info(f"Created new message from webhook: {payload.message_id}")
+        logger.info(f"Updated chat {payload.chat_id} with new message")
+
+        # Broadcast and autopilot run off the worker so a slow LLM call does not
+        # delay the next queued webhook or pin this session's connection
+        _spawn_follow_up(_run_broadcast(created_message), f"broadcast-{payload.message_id}")
+        _spawn_follow_up(_run_autopilot(created_message), f"autopilot-{payload.message_id}")
+    else:
+        logger.info(f"Message {payload.message_id} already exists, skipping")
@@ -0,0 +1,12 @@
+-- Composite index backing the chat list query (filter by account/read state, newest first).
+-- Also drops idx_chats_account_updated, which the account-scoped chat list indexes make redundant.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_chats_account_read_updated
+ON chats(account_id, is_read, updated_at DESC);
+
+DROP INDEX IF EXISTS idx_chats_account_updated;
+
+COMMIT;
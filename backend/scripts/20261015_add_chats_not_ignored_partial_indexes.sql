@@ -0,0 +1,15 @@
+-- Partial indexes for the default chat list query (is_ignored = false ORDER BY updated_at DESC),
+-- with and without an account filter.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_chats_not_ignored_updated
+ON chats(updated_at DESC)
+WHERE is_ignored = false;
+
+CREATE INDEX IF NOT EXISTS idx_chats_account_not_ignored_updated
+ON chats(account_id, updated_at DESC)
+WHERE is_ignored = false;
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Gives chats.is_ignored a server-side default and drops its standalone low-cardinality
+-- index; ignored/not-ignored lookups are covered by the partial chat-list indexes.
+-- Run this script in pgAdmin (or any PostgreSQL client) after 20261015_add_chats_not_ignored_partial_indexes.sql.
+
+BEGIN;
+
+ALTER TABLE chats
+ADD COLUMN IF NOT EXISTS is_ignored BOOLEAN NOT NULL DEFAULT false;
+
+ALTER TABLE chats
+ALTER COLUMN is_ignored SET DEFAULT false;
+
+DROP INDEX IF EXISTS ix_chats_is_ignored;
+
+COMMIT;
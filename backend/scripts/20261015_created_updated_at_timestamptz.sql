@@ -0,0 +1,29 @@
+-- Converts created_at/updated_at to TIMESTAMPTZ stamped by the database clock.
+-- Existing values were written as naive UTC, so they are interpreted AT TIME ZONE 'UTC'.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+ALTER TABLE chats
+ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+ALTER COLUMN created_at SET DEFAULT now(),
+ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC',
+ALTER COLUMN updated_at SET DEFAULT now();
+
+ALTER TABLE messages
+ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+ALTER COLUMN created_at SET DEFAULT now();
+
+ALTER TABLE chat_attendees
+ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+ALTER COLUMN created_at SET DEFAULT now(),
+ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC',
+ALTER COLUMN updated_at SET DEFAULT now();
+
+ALTER TABLE pending_messages
+ALTER COLUMN created_at TYPE TIMESTAMPTZ USING created_at AT TIME ZONE 'UTC',
+ALTER COLUMN created_at SET DEFAULT now(),
+ALTER COLUMN updated_at TYPE TIMESTAMPTZ USING updated_at AT TIME ZONE 'UTC',
+ALTER COLUMN updated_at SET DEFAULT now();
+
+COMMIT;
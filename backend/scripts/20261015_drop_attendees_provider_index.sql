@@ -0,0 +1,9 @@
+-- Drops idx_attendees_provider, which duplicates the unique index already on
+-- chat_attendees.provider_id.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_attendees_provider;
+
+COMMIT;
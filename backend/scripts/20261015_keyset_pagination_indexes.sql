@@ -0,0 +1,20 @@
+-- Adds id as a trailing DESC column to the default chat-list indexes so keyset pages
+-- ordered by (updated_at, id) need no extra sort step. The message index gets its id
+-- column from 20261015_messages_chat_timestamp_desc_index.sql.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+DROP INDEX IF EXISTS idx_chats_not_ignored_updated;
+
+CREATE INDEX IF NOT EXISTS idx_chats_not_ignored_updated
+ON chats(updated_at DESC, id DESC)
+WHERE is_ignored = false;
+
+DROP INDEX IF EXISTS idx_chats_account_not_ignored_updated;
+
+CREATE INDEX IF NOT EXISTS idx_chats_account_not_ignored_updated
+ON chats(account_id, updated_at DESC, id DESC)
+WHERE is_ignored = false;
+
+COMMIT;
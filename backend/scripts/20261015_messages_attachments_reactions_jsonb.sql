@@ -0,0 +1,11 @@
+-- Stores message attachments and reactions as JSONB (parsed binary) instead of JSON text.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+-- Rewrites the messages table; run it during a quiet period on large databases.
+
+BEGIN;
+
+ALTER TABLE messages
+ALTER COLUMN attachments TYPE JSONB USING attachments::jsonb,
+ALTER COLUMN reactions TYPE JSONB USING reactions::jsonb;
+
+COMMIT;
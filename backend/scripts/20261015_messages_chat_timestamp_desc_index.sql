@@ -0,0 +1,14 @@
+-- Rebuilds idx_messages_chat_timestamp as (chat_id, timestamp DESC, id DESC) so newest-first
+-- message pages, (timestamp, id) keyset pages and MAX(timestamp) per chat read the index in
+-- its natural order. The new index is built CONCURRENTLY under a temporary name and swapped
+-- in, so messages stays writable and is never left without an index.
+-- CONCURRENTLY cannot run inside a transaction block: run the statements one by one, not
+-- wrapped in BEGIN/COMMIT. If the build fails, drop idx_messages_chat_timestamp_new and rerun.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_messages_chat_timestamp_new
+ON messages(chat_id, timestamp DESC, id DESC);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_messages_chat_timestamp;
+
+ALTER INDEX idx_messages_chat_timestamp_new RENAME TO idx_messages_chat_timestamp;
@@ -0,0 +1,11 @@
+-- Adds a partial index over still-pending messages per chat, so the pending half
+-- of the merged message list (empty for almost every chat) costs one index probe.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_pending_messages_chat_pending
+ON pending_messages(chat_id, timestamp DESC)
+WHERE status = 'pending';
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- Converts the remaining JSON columns to JSONB (see 20261015_messages_attachments_reactions_jsonb.sql).
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+-- Rewrites the affected tables; run it during a quiet period on large databases.
+
+BEGIN;
+
+ALTER TABLE messages
+ALTER COLUMN seen_by TYPE JSONB USING seen_by::jsonb,
+ALTER COLUMN quoted TYPE JSONB USING quoted::jsonb,
+ALTER COLUMN reply_to TYPE JSONB USING reply_to::jsonb,
+ALTER COLUMN reply_by TYPE JSONB USING reply_by::jsonb;
+
+ALTER TABLE chat_attendees
+ALTER COLUMN specifics TYPE JSONB USING specifics::jsonb;
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- Moves updated_at bookkeeping to the database clock (DEFAULT now()).
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+
+BEGIN;
+
+ALTER TABLE chats
+ALTER COLUMN updated_at SET DEFAULT now();
+
+ALTER TABLE chat_attendees
+ALTER COLUMN updated_at SET DEFAULT now();
+
+ALTER TABLE pending_messages
+ALTER COLUMN updated_at SET DEFAULT now();
+
+COMMIT;
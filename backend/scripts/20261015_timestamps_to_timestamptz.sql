@@ -0,0 +1,16 @@
+-- Converts the Unipile message/chat timestamps from ISO 8601 text to TIMESTAMPTZ.
+-- Run this script in pgAdmin (or any PostgreSQL client) before deploying the change.
+-- Rewrites the affected tables; run it during a quiet period on large databases.
+
+BEGIN;
+
+ALTER TABLE messages
+ALTER COLUMN timestamp TYPE TIMESTAMPTZ USING timestamp::timestamptz;
+
+ALTER TABLE chats
+ALTER COLUMN timestamp TYPE TIMESTAMPTZ USING NULLIF(timestamp, '')::timestamptz;
+
+ALTER TABLE pending_messages
+ALTER COLUMN timestamp TYPE TIMESTAMPTZ USING timestamp::timestamptz;
+
+COMMIT;